@@ -7,20 +7,151 @@
 # • stats(), history, enable_internet attribute
 
 from __future__ import annotations
-import os, json, re, time, hashlib, requests
-from typing import Optional, Dict, List
+import os, json, re, time, hashlib, pickle, queue, threading, requests
+from collections import deque
+from concurrent.futures import Future
+from typing import Optional, Dict, List, Deque, Tuple
 from functools import lru_cache
+import numpy as np
 from bs4 import BeautifulSoup
-from fuzzywuzzy import fuzz
+import soupsieve as sv
+from rapidfuzz import fuzz, process, utils
 
 # ───────── optional semantic search ─────────
 try:
-    from sentence_transformers import SentenceTransformer, util
+    import torch
+    from sentence_transformers import SentenceTransformer
     _SEMANTIC_OK = True
 except Exception:
     _SEMANTIC_OK = False
+
+# ───────── optional ANN index for semantic search ─────────
+try:
+    import faiss
+    _FAISS_OK = True
+except Exception:
+    _FAISS_OK = False
+
+# ───────── optional fast JSON ─────────
+try:
+    import orjson
+    _ORJSON_OK = True
+except Exception:
+    _ORJSON_OK = False
+
+# ───────── optional Aho–Corasick exact matcher ─────────
+try:
+    import ahocorasick
+    _AC_OK = True
+except Exception:
+    _AC_OK = False
+
+# ───────── optional C HTML parser ─────────
+try:
+    import lxml
+    _HTML_PARSER = "lxml"
+except Exception:
+    _HTML_PARSER = "html.parser"
 # -------------------------------------------
 
+JACCARD_MIN = 0.3          # token overlap needed to be scored in the first fuzzy pass
+MATCH_CACHE_MAX = 10_000   # entries in each LocalBrain's match() LRU cache
+ENCODE_BATCH = 64          # sentence-transformers mini-batch size for the corpus encode
+SEMANTIC_MODEL = "all-MiniLM-L6-v2"
+HNSW_M = 32                # neighbours per node in the FAISS HNSW graph
+QUERY_BATCH = 32           # most concurrent queries folded into one encode call
+BATCH_WINDOW = 0.015       # seconds the query batcher waits for company
+INDEX_VERSION = 1          # bump when the pickled LocalBrain index layout changes
+LOCAL_SURE = 90            # a local fuzzy score this high is trusted without asking SemanticBrain
+
+
+def _load_json(path: str):
+    if _ORJSON_OK:
+        with open(path, "rb") as fp:
+            return orjson.loads(fp.read())
+    with open(path, "r", encoding="utf-8") as fp:
+        return json.load(fp)
+
+
+def _dump_json(path: str, data) -> None:
+    if _ORJSON_OK:
+        with open(path, "wb") as fp:
+            fp.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, "w", encoding="utf-8") as fp:
+        json.dump(data, fp, indent=2, ensure_ascii=False)
+
+
+_WS = re.compile(r'\s+')
+_PUNCT = re.compile(r'[^\w\s\u0900-\u097F]')   # keep Devanagari vowel signs
+_WORD = re.compile(r'[\w\u0900-\u097F]+')       # \w alone splits Nepali words at vowel signs
+
+
+def _normalize(text: str) -> str:
+    """Lowercase, punctuation to spaces, collapse whitespace (same splits as default_process)."""
+    return _WS.sub(' ', _PUNCT.sub(' ', text.lower())).strip()
+
+
+def _is_word_char(c: str) -> bool:
+    return c.isalnum() or c == "_" or "\u0900" <= c <= "\u097F"
+
+
+def _build_automaton(aliases: List[str], A=None):
+    """Build (or extend) the exact-alias automaton; None when pyahocorasick is missing."""
+    if not _AC_OK or (A is None and not aliases):
+        return A
+    if A is None:
+        A = ahocorasick.Automaton()
+    for a in aliases:
+        key = _normalize(a)          # queries are normalised the same way
+        if key:
+            A.add_word(key, (len(key), a))
+    A.make_automaton()
+    return A
+
+
+def _joined_len(tokens: frozenset) -> int:
+    """Length of the sorted, space-joined token string token_set_ratio compares."""
+    return sum(map(len, tokens)) + max(len(tokens) - 1, 0)
+
+
+def _alias_index(aliases: List[str]) -> Dict:
+    """Pre-processed choices, token postings and length bounds for one alias map."""
+    ai = {
+        "aliases": [],
+        "choices": np.empty(0, dtype=object),
+        "postings": {},
+        "ntok": np.empty(0, dtype=np.int64),
+        "lens": np.empty(0, dtype=np.int64),
+        "exact": {},             # normalised alias -> alias, for whole-query hits
+        "ac": None,
+    }
+    _extend_alias_index(ai, aliases)
+    return ai
+
+
+def _extend_alias_index(ai: Dict, aliases: List[str]) -> None:
+    """Append new aliases to an index in place, without touching existing rows."""
+    if not aliases:
+        return
+    base = len(ai["aliases"])
+    choices = [utils.default_process(a) for a in aliases]
+    tokens = [frozenset(c.split()) for c in choices]
+    postings: Dict[str, List[int]] = {}
+    for i, toks in enumerate(tokens, base):
+        for t in toks:
+            postings.setdefault(t, []).append(i)
+    for t, ix in postings.items():
+        old = ai["postings"].get(t)
+        new = np.array(ix, dtype=np.intp)
+        ai["postings"][t] = new if old is None else np.concatenate([old, new])
+    ai["aliases"].extend(aliases)
+    ai["exact"].update((_normalize(a), a) for a in aliases)
+    ai["choices"] = np.concatenate([ai["choices"], np.array(choices, dtype=object)])
+    ai["ntok"] = np.concatenate([ai["ntok"], [len(t) for t in tokens]])
+    ai["lens"] = np.concatenate([ai["lens"], [_joined_len(t) for t in tokens]])
+    ai["ac"] = _build_automaton(aliases, ai["ac"])
+
 
 # =============== LocalBrain =================
 class LocalBrain:
@@ -28,47 +159,147 @@ class LocalBrain:
     def __init__(self, db_path: str, min_confidence: int = 75):
         if not os.path.exists(db_path):
             raise FileNotFoundError(f"Problem DB not found: {db_path}")
-        with open(db_path, "r", encoding="utf-8") as fp:
-            self.problems: List[Dict] = json.load(fp)
+        self.problems: List[Dict] = _load_json(db_path)
 
         self.db_path = db_path
+        # learn() appends here; entries are folded back into db_path on the next load
+        self.learned_path = os.path.splitext(db_path)[0] + ".learned.jsonl"
+        self._merge_learned()
+        # built alias maps are pickled next to the DB, keyed on its content
+        self.index_path = os.path.splitext(db_path)[0] + ".index.pkl"
         self.min_conf = min_confidence
+        # per-instance: a class-level cache would key on (and keep alive) self,
+        # and one brain's cache_clear() would wipe every other brain's entries
+        self._match_cached = lru_cache(maxsize=MATCH_CACHE_MAX)(self._match_norm)
         self.en_map, self.np_map = {}, {}
-        self._build_maps()
+        if not self._load_index():
+            self._build_maps()
+            self._save_index()
+
+    def _merge_learned(self):
+        if not os.path.exists(self.learned_path):
+            return
+        with open(self.learned_path, "r", encoding="utf-8") as fp:
+            self.problems.extend(json.loads(line) for line in fp if line.strip())
+        _dump_json(self.db_path, self.problems)
+        os.remove(self.learned_path)
 
     def _build_maps(self):
         self.en_map.clear(); self.np_map.clear()
+        # answers as parallel lists (problem index -> text) so hits skip the dict lookups
+        self._en, self._np = [], []
         for idx, p in enumerate(self.problems):
-            for a in p.get("aliases", []):
-                self.en_map[a.lower()] = idx
-            for a in p.get("np_aliases", []):
-                self.np_map[a.lower()] = idx
+            self._map_problem(idx, p)
+        # everything the matcher needs per language, built once instead of per query
+        self._idx = {"en": _alias_index(list(self.en_map)), "np": _alias_index(list(self.np_map))}
+
+    def _index_key(self) -> str:
+        with open(self.db_path, "rb") as fp:
+            digest = hashlib.sha256(fp.read()).hexdigest()
+        return f"{INDEX_VERSION}:{int(_AC_OK)}:{digest}"
+
+    def _load_index(self) -> bool:
+        try:
+            with open(self.index_path, "rb") as fp:
+                key, state = pickle.load(fp)
+            if key != self._index_key():
+                return False
+        except Exception:
+            return False
+        self.en_map, self.np_map, self._en, self._np, self._idx = state
+        return True
+
+    def _save_index(self):
+        state = (self.en_map, self.np_map, self._en, self._np, self._idx)
+        try:
+            tmp = self.index_path + ".tmp"
+            with open(tmp, "wb") as fp:
+                pickle.dump((self._index_key(), state), fp, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.index_path)
+        except Exception:
+            pass
+
+    def _map_problem(self, idx: int, p: Dict):
+        for a in p.get("aliases", []):
+            self.en_map[a.lower()] = idx
+        for a in p.get("np_aliases", []):
+            self.np_map[a.lower()] = idx
+        self._en.append(p.get("en", ""))
+        self._np.append(p.get("np") or p.get("en", ""))
 
     # ------ look‑up ----------
-    @lru_cache(maxsize=500)
     def match(self, query: str, lang: str = "en", min_conf: int | None = None) -> Optional[str]:
-        if not query: return None
-        q = query.lower().strip()
-        amap = self.np_map if lang == "np" else self.en_map
-        threshold = min_conf or self.min_conf
-
-        # exact token match
-        for tok in re.findall(r'\w+', q):
-            if tok in amap:
-                return self.problems[amap[tok]].get(lang, self.problems[amap[tok]].get("en"))
-
-        # fuzzy
-        best, score = None, 0
-        for alias, idx in amap.items():
-            s = fuzz.token_set_ratio(q, alias)
-            if s > score and s >= threshold:
-                best, score = self.problems[idx].get(lang, self.problems[idx].get("en")), s
-        return best
+        ans, score = self.match_scored(query, lang, min_conf)
+        return ans if score >= (min_conf or self.min_conf) else None
+
+    def match_scored(self, query: str, lang: str = "en", min_conf: int | None = None) -> Tuple[Optional[str], float]:
+        """Best local answer and its score (0-100); scores down to LOCAL_SURE are kept
+        even under a stricter min_conf so the caller can decide."""
+        if not query: return None, 0
+        q = _normalize(query)
+        if not q: return None, 0
+        # normalise the query so trivially different spellings share one cache entry
+        return self._match_cached(q, lang, min(min_conf or self.min_conf, LOCAL_SURE))
+
+    def _match_norm(self, q: str, lang: str, threshold: int) -> Tuple[Optional[str], float]:
+        amap, answers = (self.np_map, self._np) if lang == "np" else (self.en_map, self._en)
+        ai = self._idx["np" if lang == "np" else "en"]
+        aliases, choices, lens, ac = ai["aliases"], ai["choices"], ai["lens"], ai["ac"]
+
+        # the whole query is an alias: a score of 100, nothing left to scan
+        hit = ai["exact"].get(q)
+        if hit is not None:
+            return answers[amap[hit]], 100
+
+        # exact alias match inside the query
+        if ac is not None:
+            # one pass over q finds every whole-word alias, multi-word ones included
+            best, best_len = None, 0
+            for end, (klen, alias) in ac.iter(q):
+                start = end - klen + 1
+                if (start == 0 or not _is_word_char(q[start - 1])) and \
+                   (end + 1 == len(q) or not _is_word_char(q[end + 1])) and klen > best_len:
+                    best, best_len = alias, klen
+            if best is not None:
+                return answers[amap[best]], 100
+        else:
+            for tok in _WORD.findall(q):
+                if tok in amap:
+                    return answers[amap[tok]], 100
+
+        # fuzzy: score token-overlapping aliases first, the rest only if none pass
+        qp = utils.default_process(q)
+        qtok = frozenset(qp.split())
+        # Jaccard for every alias at once: posting lists give the intersection counts
+        postings = [ai["postings"][t] for t in qtok if t in ai["postings"]]
+        inter = np.bincount(np.concatenate(postings), minlength=len(aliases)) if postings \
+            else np.zeros(len(aliases), dtype=np.int64)
+        union = ai["ntok"] + len(qtok) - inter
+        jacc = np.divide(inter, union, out=np.zeros(len(aliases)), where=union > 0)
+        # token_set_ratio is 100 whenever one token set contains the other, however
+        # low the Jaccard -- such aliases must compete with the near group
+        near = (jacc >= JACCARD_MIN) | ((inter > 0) & ((inter == ai["ntok"]) | (inter == len(qtok))))
+        # with no shared token the score is an indel ratio of the joined token strings,
+        # which can't exceed 200*min(len)/sum(len) -- skip aliases that can't reach threshold
+        lq = _joined_len(qtok)
+        reachable = 200.0 * np.minimum(lens, lq) >= threshold * (lens + lq)
+        far = ~near & ((jacc > 0) | reachable)
+
+        for group in (np.flatnonzero(near), np.flatnonzero(far)):
+            if not group.size:
+                continue
+            # whole group scored in one C call, spread over all cores
+            scores = process.cdist([qp], choices[group], scorer=fuzz.token_set_ratio, processor=None,
+                                   score_cutoff=threshold, workers=-1)[0]
+            best = int(scores.argmax())
+            if scores[best] >= threshold:
+                return answers[amap[aliases[group[best]]]], float(scores[best])
+        return None, 0
 
     # ------ teach ----------
     def learn(self, query:str, en_sol:str, np_sol:str|None=None):
         pid = hashlib.md5(query.encode()).hexdigest()[:8]
-        self.problems.append({
+        entry = {
             "id": pid,
             "aliases": [query],
             "np_aliases": [],
@@ -76,50 +307,192 @@ class LocalBrain:
             "np": np_sol or en_sol,
             "auto_fix": False,
             "learned": True
-        })
-        with open(self.db_path,"w",encoding="utf-8") as fp:
-            json.dump(self.problems, fp, indent=2, ensure_ascii=False)
-        self._build_maps()
+        }
+        with open(self.learned_path, "a", encoding="utf-8") as fp:
+            fp.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+        # index only the new entry; aliases already known just get re-pointed by _map_problem
+        new_en = list(dict.fromkeys(a.lower() for a in entry["aliases"] if a.lower() not in self.en_map))
+        new_np = list(dict.fromkeys(a.lower() for a in entry["np_aliases"] if a.lower() not in self.np_map))
+        self.problems.append(entry)
+        self._map_problem(len(self.problems) - 1, entry)
+        _extend_alias_index(self._idx["en"], new_en)
+        _extend_alias_index(self._idx["np"], new_np)
+        # any cached miss may now have an answer
+        self._match_cached.cache_clear()
 
 # =========== SemanticBrain (optional) ===========
 class SemanticBrain:
-    def __init__(self, problems: List[Dict]):
+    def __init__(self, problems: List[Dict], cache_dir: str | None = None):
         self.enabled = _SEMANTIC_OK
         if not self.enabled: return
-        self.model = SentenceTransformer("all-MiniLM-L6-v2")
+        self.cache_dir = cache_dir
+        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        # fp16 halves bandwidth on GPU; CPU half matmul is patchy, so stay fp32 there
+        self.dtype = torch.float16 if self.device == "cuda" else torch.float32
+        self.model = SentenceTransformer(SEMANTIC_MODEL, device=self.device)
         self.sentences = [p.get("en","") for p in problems]
-        self.embeds = self.model.encode(self.sentences, convert_to_tensor=True)
+        rows = self._load_cached()
+        if rows is None:
+            rows = self._encode(self.sentences)
+            self._save_cached(rows)
+        # rows are unit length, so inner product == cosine; HNSW makes lookup sub-linear
+        # and 8-bit scalar-quantized storage cuts the scan bandwidth 4x vs fp32.
+        # Quantization needs FAISS: without it (or for an empty DB, which can't be
+        # trained) search is a torch matmul over an fp16/fp32 copy instead. Only
+        # one of the two is kept.
+        self.index = self.embeds = None
+        if _FAISS_OK and len(rows):
+            self.index = faiss.IndexHNSWSQ(rows.shape[1], faiss.ScalarQuantizer.QT_8bit,
+                                           HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            self.index.train(rows)     # learns the per-dimension int8 ranges
+            self.index.add(rows)
+        else:
+            self.embeds = torch.from_numpy(rows).to(self.device, self.dtype).contiguous()
+        # concurrent searches share one forward pass (see _batch_loop)
+        self._pending: "queue.Queue[tuple[str, Future]]" = queue.Queue()
+        threading.Thread(target=self._batch_loop, daemon=True).start()
+
+    def add(self, problem: Dict):
+        """Encode only the newly taught entry and refresh the on-disk cache."""
+        if not self.enabled: return
+        # the index holds only int8 codes, so extend the fp32 cache file instead
+        prev = self._load_cached() if self.index is not None else None
+        self.sentences.append(problem.get("en",""))
+        rows = self._encode(self.sentences[-1:])
+        if self.index is not None:
+            self.index.add(rows)
+            if prev is not None:        # no file: re-encoded on the next start
+                self._save_cached(np.concatenate([prev, rows]))
+        else:
+            self.embeds = torch.cat([self.embeds, torch.from_numpy(rows).to(self.device, self.dtype)]).contiguous()
+            self._save_cached(self.embeds.float().cpu().numpy())
+
+    # ------ query micro-batching ----------
+    def _encode_query(self, query: str):
+        fut = Future()
+        self._pending.put((query, fut))
+        return fut.result()
+
+    def _batch_loop(self):
+        while True:
+            batch = [self._pending.get()]
+            deadline = time.monotonic() + BATCH_WINDOW
+            while len(batch) < QUERY_BATCH:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    break
+                try:
+                    batch.append(self._pending.get(timeout=left))
+                except queue.Empty:
+                    break
+            try:
+                rows = self._encode([q for q, _ in batch])
+                for i, (_, fut) in enumerate(batch):
+                    fut.set_result(rows[i:i + 1])
+            except Exception as e:
+                for _, fut in batch:
+                    fut.set_exception(e)
+
+    # ------ embedding cache ----------
+    def _encode(self, sentences: List[str]):
+        # one call: encode() length-sorts into mini-batches and restores order itself;
+        # unit rows make cosine similarity a single matmul per query
+        return self.model.encode(sentences, batch_size=ENCODE_BATCH, show_progress_bar=False,
+                                 normalize_embeddings=True).astype(np.float32)
+
+    def _cache_path(self) -> str:
+        key = hashlib.sha256((SEMANTIC_MODEL + "\n" + "\n".join(self.sentences)).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"embed_{key[:16]}.npy")
+
+    def _load_cached(self):
+        if not self.cache_dir: return None
+        path = self._cache_path()
+        try:
+            return np.load(path) if os.path.exists(path) else None
+        except Exception:
+            return None
+
+    def _save_cached(self, rows):
+        if not self.cache_dir: return
+        path = self._cache_path()
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with os.scandir(self.cache_dir) as it:            # drop matrices for older DB contents
+                for e in it:
+                    if e.name.startswith("embed_") and e.name.endswith(".npy") and e.path != path \
+                       and e.is_file(follow_symlinks=False):
+                        try:
+                            os.unlink(e.path)
+                        except OSError:
+                            pass
+            np.save(path, rows)
+        except OSError:
+            pass
 
     def search(self, query:str, problems:List[Dict], lang:str="en", th=0.60) -> Optional[str]:
         if not self.enabled: return None
-        qv = self.model.encode(query, convert_to_tensor=True)
-        scores = util.cos_sim(qv, self.embeds)[0]
-        idx = int(scores.argmax())
-        if float(scores[idx]) >= th:
+        qv = self._encode_query(query)
+        if self.index is not None:
+            D, I = self.index.search(qv, 1)
+            idx, score = int(I[0, 0]), float(D[0, 0])
+        else:
+            scores = self.embeds @ torch.from_numpy(qv[0]).to(self.device, self.dtype)
+            idx = int(torch.argmax(scores))
+            score = float(scores[idx])
+        if idx >= 0 and score >= th:
             return problems[idx].get(lang, problems[idx].get("en"))
         return None
 
 # =========== InternetBrain =====================
+_SEL_BODY    = sv.compile(".result__body")
+_SEL_TITLE   = sv.compile(".result__a")
+_SEL_SNIPPET = sv.compile(".result__snippet")
+
+
+class _NoResults(Exception):
+    """Raised through the lookup cache so an empty (or throttled) page isn't kept"""
+
+
+def _parse_results(html: str) -> str:
+    soup = BeautifulSoup(html, _HTML_PARSER)
+    blocks = _SEL_BODY.select(soup, limit=3)
+    if not blocks:
+        raise _NoResults
+    out=[]
+    for b in blocks:
+        a     = _SEL_TITLE.select_one(b)
+        title = a.get_text(" ",strip=True)
+        snip  = _SEL_SNIPPET.select_one(b).get_text(" ",strip=True)
+        link  = a["href"]
+        out.append(f"🔎 {title}\n📝 {snip}\n🔗 {link}")
+    return "\n\n".join(out)
+
+
 class InternetBrain:
     def __init__(self, timeout:int=8):
         self.timeout = timeout
         self.ddg_url = "https://html.duckduckgo.com/html/"
+        # one pooled session: later lookups reuse the TCP/TLS connection
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = "Mozilla/5.0"
+        # repeat questions skip the round trip; keyed on the normalised query
+        # (result pages carry per-request tokens, so caching on the HTML never hit).
+        # Only real results are cached: HTTP errors and empty pages (which is what
+        # a rate-limited request gets) raise through it and are retried next time.
+        self._fetch_cached = lru_cache(maxsize=64)(self._fetch)
+
+    def _fetch(self, query:str, lang:str) -> str:
+        hdr = {"Accept-Language":"ne" if lang=="np" else "en"}
+        res = self.session.post(self.ddg_url, data={"q":query}, headers=hdr, timeout=self.timeout)
+        res.raise_for_status()
+        return _parse_results(res.text)
 
     def search(self, query:str, lang:str="en") -> str:
         try:
-            hdr = {"User-Agent":"Mozilla/5.0","Accept-Language":"ne" if lang=="np" else "en"}
-            res = requests.post(self.ddg_url, data={"q":query}, headers=hdr, timeout=self.timeout)
-            soup = BeautifulSoup(res.text,"html.parser")
-            blocks = soup.select(".result__body")[:3]
-            if not blocks:
-                return "🔍 No relevant results online."
-            out=[]
-            for b in blocks:
-                title = b.select_one(".result__a").get_text(" ",strip=True)
-                snip  = b.select_one(".result__snippet").get_text(" ",strip=True)
-                link  = b.select_one(".result__a")["href"]
-                out.append(f"🔎 {title}\n📝 {snip}\n🔗 {link}")
-            return "\n\n".join(out)
+            return self._fetch_cached(_normalize(query) or query, lang)
+        except _NoResults:
+            return "🔍 No relevant results online."
         except Exception as e:
             return f"⚠️ Web lookup failed: {e}"
 
@@ -127,18 +500,20 @@ class InternetBrain:
 class SmartBrain:
     def __init__(self, db_path:str, enable_internet:bool=True, min_confidence:int=75):
         self.local   = LocalBrain(db_path, min_confidence)
-        self.semantic= SemanticBrain(self.local.problems)
+        self.semantic= SemanticBrain(self.local.problems,
+                                     os.path.join(os.path.dirname(os.path.abspath(db_path)), "embed_cache"))
         self.internet= InternetBrain() if enable_internet else None
         self.enable_internet = enable_internet
-        self.history: List[Dict] = []
+        self.history: Deque[Dict] = deque(maxlen=20)   # ts is epoch seconds
 
     # ------- public API ---------
     def solve(self, query:str, lang="en", min_conf=75) -> Dict[str,str]:
         self._remember(query,lang)
 
-        # 1) local
-        ans = self.local.match(query, lang, min_conf)
-        if ans:
+        # 1) local -- a LOCAL_SURE hit is good enough even under a stricter min_conf,
+        #    which saves the embedding encode in step 2
+        ans, score = self.local.match_scored(query, lang, min_conf)
+        if ans and score >= min(min_conf, LOCAL_SURE):
             return {"source":"local","answer":ans}
 
         # 2) semantic
@@ -156,17 +531,24 @@ class SmartBrain:
     def teach(self, query:str, en_sol:str, np_sol:str|None=None):
         """Alias called by GUI Teach dialog."""
         self.local.learn(query, en_sol, np_sol)
+        self.semantic.add(self.local.problems[-1])
 
     # stats used by UI
     def stats(self):
+        ci = self.local._match_cached.cache_info()
         return {
             "total_problems": len(self.local.problems),
-            "cached_matches": self.local.match.cache_info().currsize,
+            "cached_matches": ci.currsize,
+            "cache_hit_rate": round(ci.hits / (ci.hits + ci.misses), 3) if ci.hits + ci.misses else 0.0,
             "semantic": self.semantic.enabled,
             "internet": self.enable_internet
         }
 
+    def history_formatted(self) -> List[Dict]:
+        """History with human-readable timestamps (formatted on read)."""
+        return [{**h, "ts": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(h["ts"]))}
+                for h in self.history]
+
     # -------- internals ----------
     def _remember(self,q,lang):
-        self.history.append({"ts":time.strftime("%H-%m-%d %H:%M:%S"),"q":q,"lang":lang})
-        self.history = self.history[-20:]
+        self.history.append({"ts":time.time(),"q":q,"lang":lang})
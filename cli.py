@@ -5,12 +5,18 @@ Run with:  python cli.py
 """
 
 import os, json, queue, re, time, threading, subprocess, sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from functools import lru_cache
 from typing import Optional
 
 import sounddevice as sd
 import psutil
 from vosk import Model, KaldiRecognizer
+try:                                    # optional: faster Vosk result parsing
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
 
 # ─── Local imports ─────────────────────────────────────────────────────────────
 from Brain import SmartBrain
@@ -55,46 +61,96 @@ CONTACT_INFO = {
 # ══════════════════ AUDIO DEVICES ═════════════════════════════════════════════
 class Microphone:
     def __init__(self):
-        self.q = queue.Queue()
+        self.q = queue.SimpleQueue()     # C-level put: cheap on the PortAudio thread
+        self.listening = False      # only buffer audio while listen() runs
+        # 128 ms buffers; .start() returns None, so keep the stream first
         self.stream = sd.RawInputStream(
-            samplerate=16_000, blocksize=8_000, dtype='int16',
-            channels=1, callback=lambda d, *_: self.q.put(bytes(d))
-        ).start()
+            samplerate=16_000, blocksize=2_048, dtype='int16',
+            channels=1, latency='low', callback=self._callback
+        )
+        self.stream.start()
+
+    def _callback(self, d, *_):
+        if self.listening: self.q.put_nowait(bytes(d))
+
+    def listen_chunks(self, secs=CFG["max_listen_seconds"]):
+        """Yield audio buffers as they arrive, for up to `secs` seconds."""
+        # drop buffers left over from the previous turn (callback raced the flag)
+        try:
+            while True: self.q.get_nowait()
+        except queue.Empty: pass
+        deadline = time.monotonic() + secs
+        self.listening = True
+        try:
+            while (left := deadline - time.monotonic()) > 0:
+                try:  yield self.q.get(timeout=left)
+                except queue.Empty: break
+        finally:
+            self.listening = False
 
     def listen(self, secs=CFG["max_listen_seconds"]) -> bytes:
-        audio, t0 = b"", time.time()
-        while time.time() - t0 < secs:
-            try:  audio += self.q.get_nowait()
-            except queue.Empty: time.sleep(0.05)
-        return audio
+        return b"".join(self.listen_chunks(secs))
 
     def close(self): self.stream.close()
 
 class Speaker:
+    """Speaks on one worker thread so callers (main loop, detector alerts) never block."""
     def __init__(self):
-        self.eng = pyttsx3.init()
-        self.eng.setProperty('rate', 150)
+        self.q = queue.Queue()
+        threading.Thread(target=self._loop, daemon=True).start()
+
+    def _loop(self):
+        try:
+            eng = pyttsx3.init()        # pyttsx3 must stay on the thread that created it
+            eng.setProperty('rate', 150)
+        except Exception as e:
+            # keep draining the queue so wait() can't hang; Nepali still goes through gTTS
+            print(f"⚠  TTS engine unavailable: {e}")
+            eng = None
+        while True:
+            txt, lang = self.q.get()
+            try:
+                if lang == "np":
+                    t = nepali_speak(txt)
+                    if t: t.join()      # keep utterances in order
+                elif eng is not None:
+                    eng.say(txt); eng.runAndWait()
+            except Exception as e:
+                print(f"⚠  TTS error: {e}")
+            finally:
+                self.q.task_done()
 
     def speak(self, txt: str, lang: str):
         if not CFG["enable_voice"]: return
-        if lang == "np":
-            nepali_speak(txt)
-        else:
-            self.eng.say(txt); self.eng.runAndWait()
+        self.q.put((txt, lang))
+
+    def wait(self):
+        """Block until everything queued has been spoken."""
+        self.q.join()
+
+@lru_cache(maxsize=2)
+def _load_vosk_model(path: str) -> Model:
+    """Each Vosk model is hundreds of MB; load it once per process."""
+    return Model(path)
 
 # ══════════════════ CORE ASSISTANT ════════════════════════════════════════════
 class TechsewaCLI:
     def __init__(self):
         self.spk  = Speaker()
-        self.mic  = Microphone()
-        self.brain = SmartBrain(PROBLEM_DB, CFG["enable_internet"],
-                                min_confidence=CFG["min_confidence"])
-        self.rec  = KaldiRecognizer(
-            Model(os.path.join(
-                MODEL_DIR,
-                "vosk-model-small-hi-0.22" if CFG["language"]=="np"
-                else "vosk-model-small-en-us-0.15")),
-            16_000)
+        # independent slow inits (audio device, knowledge base, Vosk model) in parallel
+        model_path = os.path.join(
+            MODEL_DIR,
+            "vosk-model-small-hi-0.22" if CFG["language"]=="np"
+            else "vosk-model-small-en-us-0.15")
+        with ThreadPoolExecutor(max_workers=3) as ex:
+            mic   = ex.submit(Microphone)
+            brain = ex.submit(SmartBrain, PROBLEM_DB, CFG["enable_internet"],
+                              min_confidence=CFG["min_confidence"])
+            model = ex.submit(_load_vosk_model, model_path)
+        self.mic, self.brain = mic.result(), brain.result()
+        self.rec  = KaldiRecognizer(model.result(), 16_000)
+        self.rec.AcceptWaveform(b"\x00" * 3_200)   # warm up the decoder on 100 ms of silence
+        self.rec.Reset()
 
         # Health monitor
         self.healer   = AutoHealer()
@@ -139,12 +195,17 @@ class TechsewaCLI:
         if choice == 'k':
             return input("Type your problem: ").strip()
 
+        self.spk.wait()                 # don't record our own reply
         print("🎙  Listening…")
-        audio = self.mic.listen()
-        if self.rec.AcceptWaveform(audio):
-            txt = json.loads(self.rec.Result())["text"]
-        else:
-            txt = json.loads(self.rec.PartialResult())["partial"]
+        # decode while recording; Vosk's own endpointing ends the turn early
+        txt = ""
+        with closing(self.mic.listen_chunks()) as chunks:
+            for chunk in chunks:
+                if self.rec.AcceptWaveform(chunk):
+                    txt = _loads(self.rec.Result())["text"]
+                    if txt.strip(): break
+            else:
+                txt = _loads(self.rec.FinalResult())["text"]
         return txt.strip()
 
     def _answer(self, query: str):
@@ -152,7 +213,10 @@ class TechsewaCLI:
         res = self.brain.solve(query, CFG["language"])
         full = f"{res['answer']}{CONTACT_INFO[CFG['language']]}"
         print(f"\n🤖 Techsewa:\n{full}\n")
-        self.spk.speak(full, CFG["language"])
+        # the contact footer is its own utterance: identical text every time, so
+        # the Nepali path synthesises it once and then replays the cached mp3
+        self.spk.speak(res['answer'], CFG["language"])
+        self.spk.speak(CONTACT_INFO[CFG["language"]], CFG["language"])
 
 # ══════════════════ RUN ══════════════════════════════════════════════════════
 if __name__ == "__main__":
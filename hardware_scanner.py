@@ -1,32 +1,125 @@
+import os
+import json
+import time
+import socket
 import platform
 import psutil
 import subprocess
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+# Static hardware facts survive across runs; keyed on this machine so a copied
+# home directory doesn't report someone else's hardware
+HWINFO_CACHE = os.path.join(os.path.expanduser("~"), ".techsewa-hwinfo.json")
+PARTITIONS_TTL = 60     # seconds between re-enumerating mounted partitions
+
+
+def _fingerprint() -> str:
+    return f"{socket.gethostname()}|{platform.platform()}"
+
+
+@lru_cache(maxsize=1)
+def _windows_hardware_names() -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """(GPU names, printer names) from one PowerShell CIM query; wmic is
+    deprecated and missing on current Windows 11. Raises if the query fails,
+    so nothing is cached (here or on disk) from a failed probe."""
+    output = subprocess.check_output(
+        ["powershell", "-NoProfile", "-Command",
+         "(Get-CimInstance Win32_VideoController).Name; '--'; "
+         "(Get-CimInstance Win32_Printer).Name"],
+        creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+        timeout=15
+    ).decode(errors="replace")
+    gpus, _, printers = output.partition("--")
+    return (tuple(l.strip() for l in gpus.splitlines() if l.strip()),
+            tuple(l.strip() for l in printers.splitlines() if l.strip()))
+
+
+@lru_cache(maxsize=1)
+def _gpu_info() -> str:
+    try:
+        if platform.system() == "Windows":
+            return "\n".join(_windows_hardware_names()[0]) or "Unknown GPU"
+        elif platform.system() == "Linux":
+            result = subprocess.run(["lspci"], capture_output=True, text=True)
+            return "\n".join(l for l in result.stdout.splitlines() if "vga" in l.lower())
+        else:
+            return "Unknown GPU"
+    except (OSError, subprocess.SubprocessError):
+        return "GPU info unavailable"
+
+
+@lru_cache(maxsize=1)
+def _static_info() -> Dict:
+    """Per-boot constant part of get_system_info, from disk when the fingerprint matches."""
+    fp = _fingerprint()
+    try:
+        with open(HWINFO_CACHE, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("fingerprint") == fp:
+            return cached["info"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    info = {
+        'system': platform.system(),
+        'processor': platform.processor(),
+        'architecture': platform.architecture()[0],
+        'physical_cores': psutil.cpu_count(logical=False),
+        'total_cores': psutil.cpu_count(logical=True),
+        'ram': round(psutil.virtual_memory().total / (1024 ** 3), 2),  # in GB
+        'gpu': _gpu_info()
+    }
+    if info['gpu'] == "GPU info unavailable":
+        return info                             # probe failed; retry next run
+    try:
+        tmp = HWINFO_CACHE + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": fp, "info": info}, f, indent=2)
+        os.replace(tmp, HWINFO_CACHE)
+    except OSError:
+        pass
+    return info
+
+
+@lru_cache(maxsize=1)
+def _printers() -> tuple:
+    try:
+        if platform.system() == "Windows":
+            return _windows_hardware_names()[1]
+        else:
+            return ("Printer scanning not implemented for this OS",)
+    except (OSError, subprocess.SubprocessError):
+        return ("Printer scan failed",)
+
 
 class HardwareScanner:
     """Basic hardware scanning functionality"""
-    
+
     def __init__(self):
+        self._partitions = []
+        self._partitions_ts = float("-inf")
         self.system_info = self.get_system_info()
-    
+
     def get_system_info(self) -> Dict:
         """Get basic system hardware information"""
-        return {
-            'system': platform.system(),
-            'processor': platform.processor(),
-            'architecture': platform.architecture()[0],
-            'physical_cores': psutil.cpu_count(logical=False),
-            'total_cores': psutil.cpu_count(logical=True),
-            'ram': round(psutil.virtual_memory().total / (1024 ** 3), 2),  # in GB
-            'disks': self.get_disk_info(),
-            'gpu': self.get_gpu_info()
-        }
-    
+        info = dict(_static_info())
+        info['disks'] = self.get_disk_info()    # usage changes, so always live
+        return info
+
     def get_disk_info(self) -> List[Dict]:
         """Get information about all disks"""
+        if time.monotonic() - self._partitions_ts > PARTITIONS_TTL:
+            # empty optical drives can block disk_usage for seconds
+            self._partitions = [p for p in psutil.disk_partitions() if 'cdrom' not in p.opts]
+            self._partitions_ts = time.monotonic()
         disks = []
-        for partition in psutil.disk_partitions():
-            usage = psutil.disk_usage(partition.mountpoint)
+        for partition in self._partitions:
+            try:
+                usage = psutil.disk_usage(partition.mountpoint)
+            except OSError:
+                # the partition list is cached, so a mount may have gone away since
+                continue
             disks.append({
                 'device': partition.device,
                 'mountpoint': partition.mountpoint,
@@ -35,37 +128,11 @@ class HardwareScanner:
                 'free_gb': round(usage.free / (1024 ** 3), 2)
             })
         return disks
-    
+
     def get_gpu_info(self) -> str:
         """Try to get GPU information"""
-        try:
-            if platform.system() == "Windows":
-                result = subprocess.run(
-                    ["wmic", "path", "win32_VideoController", "get", "name"],
-                    capture_output=True, text=True
-                )
-                return result.stdout.strip().split('\n')[-1]
-            elif platform.system() == "Linux":
-                result = subprocess.run(
-                    ["lspci", "|", "grep", "-i", "vga"],
-                    capture_output=True, text=True, shell=True
-                )
-                return result.stdout.strip()
-            else:
-                return "Unknown GPU"
-        except:
-            return "GPU info unavailable"
-    
+        return _gpu_info()
+
     def scan_printers(self) -> List[str]:
-        """Scan for connected printers"""
-        try:
-            if platform.system() == "Windows":
-                result = subprocess.run(
-                    ["wmic", "printer", "get", "name"],
-                    capture_output=True, text=True
-                )
-                return [p.strip() for p in result.stdout.split('\n')[1:] if p.strip()]
-            else:
-                return ["Printer scanning not implemented for this OS"]
-        except:
-            return ["Printer scan failed"]
\ No newline at end of file
+        """Scan for connected printers (once per process)"""
+        return list(_printers())
@@ -4,7 +4,9 @@ import queue
 import re
 import time
 import threading
-import subprocess
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from functools import lru_cache
 from typing import Optional, Dict
 
@@ -13,6 +15,12 @@ import pyttsx3
 from vosk import Model, KaldiRecognizer
 import psutil
 
+# Optional faster JSON for the per-chunk Vosk results
+try:
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
+
 # Local imports
 from Brain import SmartBrain
 
@@ -35,21 +43,23 @@ class Config:
 
     @classmethod
     def load(cls):
-        """Load settings from config file"""
-        if not os.path.exists(cls.CONFIG_FILE):
-            cls._create_default_config()
+        """Load settings from config file (writes the defaults if it is missing)"""
         try:
             with open(cls.CONFIG_FILE, "r", encoding="utf-8") as f:
                 settings = json.load(f)
-                cls.MAX_LISTEN_SECONDS = settings.get("max_listen_seconds", cls.MAX_LISTEN_SECONDS)
-                cls.MIN_CONFIDENCE = settings.get("min_confidence", cls.MIN_CONFIDENCE)
-                cls.ENABLE_VOICE = settings.get("enable_voice", cls.ENABLE_VOICE)
-                cls.ENABLE_DIAGNOSTICS = settings.get("enable_diagnostics", cls.ENABLE_DIAGNOSTICS)
-                cls.ENABLE_INTERNET = settings.get("enable_internet", cls.ENABLE_INTERNET)
-                cls.LANGUAGE = settings.get("language", cls.LANGUAGE)
+        except FileNotFoundError:
+            cls._create_default_config()     # defaults are already in place
+            return
         except Exception as e:
             print(f"⚠️ Config error: {e}")
             cls._create_default_config()
+            return
+        cls.MAX_LISTEN_SECONDS = settings.get("max_listen_seconds", cls.MAX_LISTEN_SECONDS)
+        cls.MIN_CONFIDENCE = settings.get("min_confidence", cls.MIN_CONFIDENCE)
+        cls.ENABLE_VOICE = settings.get("enable_voice", cls.ENABLE_VOICE)
+        cls.ENABLE_DIAGNOSTICS = settings.get("enable_diagnostics", cls.ENABLE_DIAGNOSTICS)
+        cls.ENABLE_INTERNET = settings.get("enable_internet", cls.ENABLE_INTERNET)
+        cls.LANGUAGE = settings.get("language", cls.LANGUAGE)
 
     @classmethod
     def _create_default_config(cls):
@@ -65,10 +75,8 @@ class Config:
         with open(cls.CONFIG_FILE, "w", encoding="utf-8") as f:
             json.dump(default, f, indent=2)
 
-Config.load()
-
 # ====================== CONTACT INFORMATION ==================
-CONTACT_INFO = {
+CONTACT_INFO = MappingProxyType({
     "en": (
         "\n📍 Visit: Learning Mission & Training Center, Thuphandanda, Dadeldhura\n"
         "📞 Phone: 9867315931\n"
@@ -79,83 +87,186 @@ CONTACT_INFO = {
         "📞 फोन: ९८६७३१५९३१\n"
         "📧 इमेल: learnermission@gmail.com"
     )
-}
+})
 
 # ====================== AUDIO HANDLING =======================
 class Microphone:
     """Non-blocking microphone input"""
     
     def __init__(self):
-        self.queue = queue.Queue()
+        self.queue = queue.SimpleQueue()   # C-level put, no Python lock on the audio thread
+        # plain bool: one writer (listen) and one reader (audio thread), no lock needed
+        self.listening = False
         self.stream = sd.RawInputStream(
             samplerate=16000,
-            blocksize=8000,
+            blocksize=2048,     # 128 ms buffers (8000 was a 500 ms hardware period)
             dtype='int16',
             channels=1,
+            latency='low',
             callback=self._callback
         )
         self.stream.start()
 
     def _callback(self, indata, frames, time, status):
-        """Audio callback function"""
-        self.queue.put(bytes(indata))
+        """Audio callback function (PortAudio thread: never block here)"""
+        if self.listening:
+            self.queue.put_nowait(bytes(indata))
+
+    def stream_chunks(self, seconds: float):
+        """Yield audio buffers as they arrive, for up to the given duration"""
+        # drop buffers left over from the previous turn (callback raced the flag)
+        try:
+            while True:
+                self.queue.get_nowait()
+        except queue.Empty:
+            pass
+        self.listening = True
+        deadline = time.monotonic() + seconds
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    # block until the next buffer arrives instead of polling
+                    yield self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+        finally:
+            self.listening = False
 
     def listen(self, seconds: float) -> bytes:
         """Record audio for specified duration"""
-        audio = b""
-        start = time.time()
-        while time.time() - start < seconds:
-            try:
-                audio += self.queue.get_nowait()
-            except queue.Empty:
-                time.sleep(0.05)
-        return audio
+        return b"".join(self.stream_chunks(seconds))
 
     def close(self):
         """Release audio resources"""
         self.stream.close()
 
+# ====================== SYSTEM SAMPLER =======================
+class SystemSampler:
+    """Background thread keeping a fresh CPU/RAM/disk snapshot"""
+
+    def __init__(self, interval: float = 2.0):
+        self.interval = interval
+        self.snapshot = self._sample()
+        self._stop = threading.Event()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _sample(self) -> Dict:
+        return {
+            "cpu": psutil.cpu_percent(interval=None),
+            "ram": psutil.virtual_memory().percent,
+            "disk": psutil.disk_usage('/').percent
+        }
+
+    def _run(self):
+        # psutil keeps the cpu_percent baseline per thread: prime this one's,
+        # or the first background snapshot reads 0.0
+        psutil.cpu_percent(interval=None)
+        while not self._stop.wait(self.interval):
+            # rebinding one dict is atomic, so readers never see a half-updated snapshot
+            self.snapshot = self._sample()
+
+    def stop(self):
+        self._stop.set()
+
 # ====================== SPEECH SYNTHESIS =====================
+_NON_NEPALI = re.compile(r'[^\w\s\u0900-\u097F]')
+
 class Speaker:
-    """Text-to-speech with language support"""
+    """Text-to-speech with language support, spoken on a worker thread"""
     
     def __init__(self):
-        self.engine = pyttsx3.init()
-        self.engine.setProperty('rate', 150)
+        self.queue = queue.Queue()
+        threading.Thread(target=self._worker, daemon=True).start()
+
+    def _worker(self):
+        """Own the engine: pyttsx3 drivers must run on the thread that created them"""
+        try:
+            engine = pyttsx3.init()
+            engine.setProperty('rate', 150)
+        except Exception as e:
+            # keep draining the queue so wait() can't hang; replies stay text-only
+            print(f"⚠️ TTS engine unavailable: {e}")
+            engine = None
+        while True:
+            text = self.queue.get()
+            try:
+                if engine is not None:
+                    engine.say(text)
+                    engine.runAndWait()
+            except Exception as e:
+                print(f"⚠️ TTS error: {e}")
+            finally:
+                self.queue.task_done()
         
     def speak(self, text: str, lang: str = "en"):
-        """Speak text with language filtering"""
+        """Queue text for speech with language filtering (returns immediately)"""
         if not Config.ENABLE_VOICE:
             return
             
         # Basic language filtering
         if lang == "np":
-            text = re.sub(r'[^\w\s\u0900-\u097F]', '', text)
-        self.engine.say(text)
-        self.engine.runAndWait()
+            text = _NON_NEPALI.sub('', text)
+        self.queue.put(text)
+
+    def clear(self):
+        """Drop utterances that haven't started yet"""
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                return
+            self.queue.task_done()
+
+    def wait(self):
+        """Block until the current utterance has finished"""
+        self.queue.join()
+
+# ====================== SPEECH RECOGNITION ===================
+VOSK_MODELS = {
+    "en": "vosk-model-small-en-us-0.15",
+    "np": "vosk-model-small-hi-0.22"
+}
+
+@lru_cache(maxsize=2)
+def load_model(path: str) -> Model:
+    """Load a Vosk model once per process (each is hundreds of MB)"""
+    return Model(path)
 
 # ====================== CORE ASSISTANT =======================
 class TechsewaAssistant:
     """Main assistant class"""
     
     def __init__(self):
-        self.mic = Microphone()
         self.speaker = Speaker()
-        self.brain = SmartBrain(
-            Config.PROBLEM_DB,
-            Config.ENABLE_INTERNET,
-            min_confidence=Config.MIN_CONFIDENCE
-        )
-        self.recognizer = self._init_recognizer()
-
-    def _init_recognizer(self):
-        """Initialize speech recognizer based on language"""
-        model_path = os.path.join(
-            Config.MODEL_DIR,
-            "vosk-model-small-hi-0.22" if Config.LANGUAGE == "np" 
-            else "vosk-model-small-en-us-0.15"
-        )
-        return KaldiRecognizer(Model(model_path), 16000)
+        self._recognizers = {}
+        # audio device, knowledge base and Vosk model are independent and each slow
+        # to open (the model load runs in C++ without the GIL): load them side by side
+        with ThreadPoolExecutor(max_workers=3) as ex:
+            mic = ex.submit(Microphone)
+            brain = ex.submit(
+                SmartBrain,
+                Config.PROBLEM_DB,
+                Config.ENABLE_INTERNET,
+                min_confidence=Config.MIN_CONFIDENCE
+            )
+            recognizer = ex.submit(self._init_recognizer)
+        self.mic, self.brain, self.recognizer = mic.result(), brain.result(), recognizer.result()
+        self.sampler = SystemSampler() if Config.ENABLE_DIAGNOSTICS else None
+
+    def _init_recognizer(self, lang: Optional[str] = None):
+        """Speech recognizer for a language, built once and reused on later switches"""
+        lang = lang or Config.LANGUAGE
+        if lang not in self._recognizers:
+            model_path = os.path.join(Config.MODEL_DIR, VOSK_MODELS.get(lang, VOSK_MODELS["en"]))
+            rec = KaldiRecognizer(load_model(model_path), 16000)
+            # pay the decoder's lazy init now (100 ms of silence), not on the first query
+            rec.AcceptWaveform(b"\x00" * 3200)
+            rec.Reset()
+            self._recognizers[lang] = rec
+        return self._recognizers[lang]
 
     def run(self):
         """Main interaction loop"""
@@ -181,6 +292,8 @@ class TechsewaAssistant:
             print("\nShutting down...")
         finally:
             self.mic.close()
+            if self.sampler:
+                self.sampler.stop()
 
     def _get_input(self) -> Optional[str]:
         """Get user input via voice or text"""
@@ -194,17 +307,26 @@ class TechsewaAssistant:
         if cmd == 'k':
             return input("⌨️ Describe your problem: ").strip()
             
+        # don't record our own voice: skip stale replies, let the current one finish
+        self.speaker.clear()
+        self.speaker.wait()
         print("🔊 Listening..." if Config.LANGUAGE == "en" else "🔊 सुन्दै...")
-        audio = self.mic.listen(Config.MAX_LISTEN_SECONDS)
-        if not audio:
+        self.recognizer = self._init_recognizer(Config.LANGUAGE)
+        result, heard = "", False
+        # decode each buffer while the next one records; stop at Vosk's end of utterance
+        with closing(self.mic.stream_chunks(Config.MAX_LISTEN_SECONDS)) as chunks:
+            for chunk in chunks:
+                heard = True
+                if self.recognizer.AcceptWaveform(chunk):
+                    result = _loads(self.recognizer.Result()).get("text", "")
+                    if result.strip():
+                        break
+            else:
+                result = _loads(self.recognizer.FinalResult()).get("text", "")
+        if not heard:
             print("No audio detected" if Config.LANGUAGE == "en" else "ध्वनि पत्ता लागेन")
             return None
             
-        if self.recognizer.AcceptWaveform(audio):
-            result = json.loads(self.recognizer.Result()).get("text", "")
-        else:
-            result = json.loads(self.recognizer.PartialResult()).get("partial", "")
-            
         return result if result.strip() else None
 
     def _process_query(self, query: str):
@@ -221,11 +343,7 @@ class TechsewaAssistant:
 
     def _run_diagnostics(self):
         """Run system diagnostics"""
-        diag = {
-            "cpu": psutil.cpu_percent(interval=1),
-            "ram": psutil.virtual_memory().percent,
-            "disk": psutil.disk_usage('/').percent
-        }
+        diag = self.sampler.snapshot   # sampled in the background, no 1 s block here
         
         report = (
             f"🖥️ CPU: {diag['cpu']}%\n"
@@ -239,5 +357,6 @@ class TechsewaAssistant:
 
 # ====================== MAIN ENTRY ============================
 if __name__ == "__main__":
+    Config.load()
     assistant = TechsewaAssistant()
     assistant.run()
\ No newline at end of file
@@ -1,8 +1,9 @@
 # nepali_tts.py - enhanced version with additional features
 from gtts import gTTS
 from playsound import playsound
-import hashlib, os, threading
+import hashlib, os, re, tempfile, threading
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 # Configure logging
@@ -11,15 +12,43 @@ logger = logging.getLogger('NepaliTTS')
 
 CACHE_DIR = "tts_cache"
 os.makedirs(CACHE_DIR, exist_ok=True)
+# Known cache entries, so hits skip the filesystem stat
+_cached = {e.name for e in os.scandir(CACHE_DIR) if e.name.endswith(".mp3")}
+
+# Sentences are synthesised concurrently (each is a gTTS network round trip)
+# and played back in order as they become ready
+_SENTENCE_END = re.compile(r'(?<=[।.!?])\s+')
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="gtts")
+
+def _ensure_cached(text: str, slow: bool) -> str:
+    """Return the cached mp3 for text, generating it on a miss."""
+    # Create consistent filename (handle Unicode properly)
+    name = hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest() + ".mp3"
+    filename = os.path.join(CACHE_DIR, name)
+    if name not in _cached and not os.path.exists(filename):
+        # never leave a half-written mp3 in the cache; the temp name is unique
+        # because workers may synthesise the same sentence at once
+        with tempfile.NamedTemporaryFile(dir=CACHE_DIR, suffix=".part", delete=False) as f:
+            tmp = f.name
+            try:
+                gTTS(text=text, lang="ne", slow=slow).write_to_fp(f)
+            except BaseException:
+                f.close()
+                os.unlink(tmp)
+                raise
+        os.replace(tmp, filename)
+        logger.debug(f"Generated TTS for: {text[:50]}...")
+    _cached.add(name)
+    return filename
 
 def speak(text: str, slow: bool = False) -> Optional[threading.Thread]:
     """
     Speak Nepali text asynchronously with cached mp3 files.
-    
+
     Args:
         text: Nepali text to speak
         slow: Whether to speak slowly (for difficult words)
-        
+
     Returns:
         Thread object if playback started, None if failed
     """
@@ -27,28 +56,21 @@ def speak(text: str, slow: bool = False) -> Optional[threading.Thread]:
         return None
 
     try:
-        # Create consistent filename (handle Unicode properly)
-        filename = os.path.join(
-            CACHE_DIR, 
-            hashlib.md5(text.encode('utf-8')).hexdigest() + ".mp3"
-        )
-        
-        # Generate & cache if not present
-        if not os.path.exists(filename):
-            gTTS(text=text, lang="ne", slow=slow).save(filename)
-            logger.debug(f"Generated TTS for: {text[:50]}...")
-        
+        sentences = [s for s in _SENTENCE_END.split(text.strip()) if s.strip()]
+        futures = [_executor.submit(_ensure_cached, s, slow) for s in sentences]
+
         # Start playback thread
         def _play():
-            try:
-                playsound(filename)
-            except Exception as e:
-                logger.error(f"Playback failed for '{text[:30]}...': {str(e)}")
-        
+            for sentence, fut in zip(sentences, futures):
+                try:
+                    playsound(fut.result())
+                except Exception as e:
+                    logger.error(f"Playback failed for '{sentence[:30]}...': {str(e)}")
+
         thread = threading.Thread(target=_play, daemon=True)
         thread.start()
         return thread
-        
+
     except Exception as e:
         logger.error(f"TTS generation failed for '{text[:30]}...': {str(e)}")
-        return None
\ No newline at end of file
+        return None
@@ -1,8 +1,160 @@
+import os
+import sys
 import psutil
+import numpy as np
 import time
 import threading
+import itertools
+import sched
+import traceback
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from enum import Enum, auto
-from typing import Callable
+from typing import Any, Callable, NamedTuple, Optional, Tuple
+
+PARTITIONS_TTL = 300            # seconds between re-reading the mount table
+SKIP_RETRY = 3600               # seconds before unreadable mounts are tried again
+# Pseudo / image filesystems that are always "full" or not user storage
+_SKIP_FSTYPES = frozenset({"squashfs", "tmpfs", "devtmpfs", "overlay", "iso9660", "udf"})
+SLOW_EVERY = 6                  # disk and battery move in minutes; read them every Nth tick
+DISK_WORKERS = 4                # statvfs calls in flight at once (network mounts can be slow)
+MAX_BACKOFF = 6                 # quiet system: interval doubles up to this many check_intervals
+NEAR = 0.8                      # "near" a threshold once a reading passes 80% of it
+MONITOR_NICE = 10               # the monitor shouldn't compete with what it's watching
+HYSTERESIS = 5                  # points back inside a threshold before a problem clears
+
+# Not every psutil build has it; resolved once rather than hasattr() per read
+_sensors_battery = getattr(psutil, "sensors_battery", None)
+
+# On Linux, power_supply uevents tell us when the battery changed, so it
+# needn't be polled at all
+try:
+    import pyudev
+    _UDEV_OK = sys.platform.startswith("linux")
+except ImportError:
+    _UDEV_OK = False
+
+if hasattr(os, "statvfs"):
+    def _disk_percent(mountpoint: str) -> float:
+        # psutil.disk_usage's percent (root-reserved blocks excluded), minus its wrapper
+        st = os.statvfs(mountpoint)
+        used = st.f_blocks - st.f_bfree
+        avail = used + st.f_bavail
+        return 100.0 * used / avail if avail else 0.0
+else:                           # Windows
+    def _disk_percent(mountpoint: str) -> float:
+        return psutil.disk_usage(mountpoint).percent
+
+def _disk_percent_or_nan(mountpoint: str) -> float:
+    try:
+        return _disk_percent(mountpoint)
+    except OSError:             # unmounted since the last refresh, or no access
+        return np.nan           # never compares over the threshold
+
+class _PsutilStats:
+    """Portable fast-tier readings"""
+    closed = False
+
+    def __init__(self):
+        # our own baseline: psutil.cpu_percent() keeps one per thread, and
+        # readings are taken on the monitor thread, not the constructing one
+        self._cpu_prev = self._cpu_times()
+
+    def _cpu_times(self) -> Tuple[float, float]:
+        t = psutil.cpu_times()
+        # guest time is already counted in user on Linux
+        total = sum(t) - getattr(t, "guest", 0.0) - getattr(t, "guest_nice", 0.0)
+        return total, t.idle + getattr(t, "iowait", 0.0)
+
+    def cpu_percent(self) -> float:
+        total, idle = self._cpu_times()
+        dt, di = total - self._cpu_prev[0], idle - self._cpu_prev[1]
+        self._cpu_prev = (total, idle)
+        return round(100.0 * (dt - di) / dt, 1) if dt > 0 else 0.0
+
+    def mem_percent(self) -> float:
+        return psutil.virtual_memory().percent
+
+    def net_bytes(self) -> Tuple[int, int]:
+        net = psutil.net_io_counters()
+        return net.bytes_sent, net.bytes_recv
+
+    def close(self):
+        pass
+
+class _ProcStats(_PsutilStats):
+    """Linux: keep the /proc files open and re-read them in place each tick,
+    skipping psutil's open/close and namedtuple building"""
+
+    def __init__(self):
+        self._stat = self._mem = self._net = -1
+        self.closed = False
+        try:
+            self._stat = os.open("/proc/stat", os.O_RDONLY)
+            self._mem = os.open("/proc/meminfo", os.O_RDONLY)
+            self._net = os.open("/proc/net/dev", os.O_RDONLY)
+            self._cpu_prev = self._cpu_times()
+        except BaseException:
+            self.close()                        # don't leak the ones that opened
+            raise
+
+    @staticmethod
+    def _read(fd: int, size: int = 16384) -> bytes:
+        # pread from offset 0 regenerates the file in one syscall (no lseek)
+        data = os.pread(fd, size, 0)
+        while len(data) % size == 0 and data:   # filled the buffer; there may be more
+            chunk = os.pread(fd, size, len(data))
+            if not chunk:
+                break
+            data += chunk
+        return data
+
+    def _cpu_times(self) -> Tuple[int, int]:
+        t = [int(x) for x in self._read(self._stat).split(b"\n", 1)[0].split()[1:9]]
+        return sum(t), t[3] + t[4]              # user..steal (guest is inside user), idle+iowait
+
+    def mem_percent(self) -> float:
+        info = {}
+        for line in self._read(self._mem).splitlines():
+            key, _, rest = line.partition(b":")
+            if key == b"MemTotal" or key == b"MemAvailable":
+                info[key] = int(rest.split()[0])
+                if len(info) == 2:
+                    break
+        total = info[b"MemTotal"]
+        return round(100.0 * (total - info[b"MemAvailable"]) / total, 1)
+
+    def net_bytes(self) -> Tuple[int, int]:
+        sent = recv = 0
+        for line in self._read(self._net).splitlines()[2:]:
+            fields = line.partition(b":")[2].split()
+            recv += int(fields[0])
+            sent += int(fields[8])
+        return sent, recv
+
+    def close(self):
+        # idempotent: a second close must not hit fd numbers reused since
+        if self.closed:
+            return
+        self.closed = True
+        for fd in (self._stat, self._mem, self._net):
+            if fd >= 0:
+                os.close(fd)
+        self._stat = self._mem = self._net = -1
+
+def _open_stats() -> _PsutilStats:
+    if sys.platform.startswith("linux"):
+        try:
+            stats = _ProcStats()
+        except (OSError, ValueError, IndexError, KeyError):
+            return _PsutilStats()
+        try:
+            stats.mem_percent(), stats.net_bytes()     # fail here, not in the monitor
+            return stats
+        except (OSError, ValueError, IndexError, KeyError):
+            stats.close()
+    return _PsutilStats()
 
 class ProblemType(Enum):
     NETWORK = auto()
@@ -12,93 +164,372 @@ class ProblemType(Enum):
     STORAGE = auto()
     SOFTWARE = auto()
 
+@dataclass
+class Sample:
+    """One monitor tick's worth of sensor readings"""
+    cpu: float
+    mem_pct: float
+    net_sent: int                       # cumulative bytes, all interfaces
+    net_recv: int
+    net_ts: float
+    # Slow tier; None on ticks where they weren't read
+    disk_pct: Optional[np.ndarray] = None   # percent used, NaN if unreadable
+    disk_mounts: Tuple[str, ...] = ()       # aligned with disk_pct
+    battery: Optional[Any] = None
+
+# Legacy callback(message, code) text, formatted from the structured payload
+_MESSAGES = {
+    101: "Network connection unstable",
+    102: "Low battery: {percent}% remaining",
+    103: "High CPU usage: {percent}%",
+    104: "High memory usage: {percent}%",
+    105: "Low disk space on {mountpoint}: {percent}%",
+}
+
+class _Limits(NamedTuple):
+    """Immutable copy of the thresholds the checks read; swapped whole on update"""
+    cpu: float
+    mem: float
+    disk: float
+    up: float
+    down: float
+    battery: float
+
+def _deprioritise():
+    """Linux only: renice and pin just this thread (the statvfs workers it
+    spawns inherit both). Elsewhere the calls are process-wide, so skip."""
+    if not sys.platform.startswith("linux"):
+        return
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), MONITOR_NICE)
+    except OSError:
+        pass
+    try:
+        cpus = os.sched_getaffinity(0)
+        if len(cpus) > 1:
+            os.sched_setaffinity(0, {max(cpus)})    # pid 0 = calling thread
+    except OSError:
+        pass
+
+class _SharedScheduler:
+    """One daemon thread runs the ticks of every started ProblemDetector, so
+    several detectors cost one thread and one timer wakeup per due tick"""
+
+    def __init__(self):
+        self._wake = threading.Event()
+        self._sched = sched.scheduler(time.monotonic, self._delay)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _delay(self, timeout: float):
+        # woken early by enter() so a new, sooner entry isn't slept through
+        self._wake.wait(timeout)
+        self._wake.clear()
+
+    def enter(self, delay: float, action: Callable[[], None]):
+        with self._lock:
+            event = self._sched.enter(delay, 0, action)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="problem-detector",
+                                                daemon=True)
+                self._thread.start()
+        self._wake.set()
+        return event
+
+    def cancel(self, event):
+        try:
+            self._sched.cancel(event)
+        except ValueError:                  # already running or ran
+            pass
+        self._wake.set()
+
+    def _run(self):
+        _deprioritise()
+        while True:
+            self._sched.run()
+            with self._lock:                # exit only if nothing slipped in meanwhile
+                if self._sched.empty():
+                    self._thread = None
+                    return
+
+_SCHEDULER = _SharedScheduler()
+
 class ProblemDetector:
-    def __init__(self, callback: Callable[[str, int], None], check_interval: int = 10):
+    def __init__(self, callback: Callable[..., None], check_interval: int = 10,
+                 structured: bool = False):
         """
         Initialize the problem detector.
         
         Args:
             callback: Function to call when a problem is detected
             check_interval: How often to check for problems (in seconds)
+            structured: Call callback(code, payload) with the raw readings
+                instead of callback(message, code)
         """
         self.callback = callback
+        self.structured = structured
         self.check_interval = check_interval
-        self._running = False
-        self._thread = None
+        self._stop_event = threading.Event()
+        self._lock = threading.RLock()      # RLock: the callback may call stop()
+        self._scheduled = None              # pending entry on _SCHEDULER
         
         # Thresholds for problem detection
-        self.thresholds = {
+        thresholds = {
             ProblemType.CPU: 90,        # CPU usage %
             ProblemType.MEMORY: 90,     # Memory usage %
             ProblemType.STORAGE: 90,    # Disk usage %
-            ProblemType.NETWORK: {
+            ProblemType.POWER: 20,      # Battery % left (on battery power)
+            ProblemType.NETWORK: MappingProxyType({
                 'min_upload': 10,       # KB/s
                 'min_download': 10      # KB/s
-            }
+            })
         }
+        self._publish(thresholds)
+        # Problems already reported and not yet cleared
+        self._active = set()
+        self._low_disks = set()
+        self._disks_near = False
+        self._battery_near = False
+
+        # Non-blocking samples: CPU % and network rates are measured over the
+        # gap between monitor cycles instead of sleeping inside each check
+        self._stats = _open_stats()
+        self._last_net = self._stats.net_bytes()
+        self._last_net_ts = time.monotonic()
+        self._mounts: Tuple[str, ...] = ()
+        self._disk_pct = np.empty(0, dtype=np.float32)     # reused between reads
+        self._partitions_ts = float("-inf")
+        self._skip_mounts = set()           # failed statvfs; left out until SKIP_RETRY
+        self._skip_ts = time.monotonic()
+        self._ticks = itertools.count()
+        self._battery_dirty = True          # read once at start, then on uevents
+        self._udev_observer = None
+        self._disk_pool = None              # created on the first multi-mount sweep
         
+    def _publish(self, thresholds: dict):
+        # Readers take self._plan once per tick; each assignment below is a
+        # single reference swap, so the monitor never sees a half-applied update
+        net = thresholds[ProblemType.NETWORK]
+        lim = _Limits(thresholds[ProblemType.CPU], thresholds[ProblemType.MEMORY],
+                      thresholds[ProblemType.STORAGE],
+                      net['min_upload'], net['min_download'],
+                      thresholds[ProblemType.POWER])
+        self._plan = (lim, self._make_fast_check(lim))
+        self.thresholds = MappingProxyType(thresholds)      # read-only view
+    
+    def set_threshold(self, problem: ProblemType, value):
+        """Change a threshold (a dict with min_upload/min_download for NETWORK)"""
+        thresholds = dict(self.thresholds)
+        thresholds[problem] = MappingProxyType(dict(value)) if isinstance(value, dict) else value
+        self._publish(thresholds)
+    
     def start(self):
-        """Start the problem detection thread"""
-        if not self._running:
-            self._running = True
-            self._thread = threading.Thread(target=self._monitor, daemon=True)
-            self._thread.start()
+        """Start problem detection on the shared monitor thread"""
+        with self._lock:
+            if self._scheduled is not None:
+                return
+            self._stop_event.clear()
+            if self._stats.closed:              # restarted after stop()
+                self._stats = _open_stats()
+                self._last_net, self._last_net_ts = self._stats.net_bytes(), time.monotonic()
+            self._start_udev()
+            self._interval = self.check_interval
+            self._scheduled = _SCHEDULER.enter(0, self._tick)
+    
+    def _start_udev(self):
+        if not (_UDEV_OK and _sensors_battery) or self._udev_observer:
+            return
+        try:
+            monitor = pyudev.Monitor.from_netlink(pyudev.Context())
+            monitor.filter_by(subsystem="power_supply")
+            self._udev_observer = pyudev.MonitorObserver(
+                monitor, callback=lambda device: setattr(self, "_battery_dirty", True),
+                daemon=True)
+            self._udev_observer.start()
+        except Exception:                   # no netlink access (containers); keep polling
+            self._udev_observer = None
     
     def stop(self):
-        """Stop the problem detection thread"""
-        self._running = False
-        if self._thread and self._thread.is_alive():
-            self._thread.join()
-    
-    def _monitor(self):
-        """Main monitoring loop"""
-        while self._running:
-            self._check_cpu()
-            self._check_memory()
-            self._check_storage()
-            self._check_network()
-            self._check_power()
-            
-            time.sleep(self.check_interval)
-    
-    def _check_cpu(self):
-        """Check for high CPU usage"""
-        cpu_percent = psutil.cpu_percent(interval=1)
-        if cpu_percent > self.thresholds[ProblemType.CPU]:
-            self.callback(f"High CPU usage: {cpu_percent}%", 103)
-    
-    def _check_memory(self):
-        """Check for high memory usage"""
-        mem = psutil.virtual_memory()
-        if mem.percent > self.thresholds[ProblemType.MEMORY]:
-            self.callback(f"High memory usage: {mem.percent}%", 104)
-    
-    def _check_storage(self):
-        """Check for low disk space"""
-        for part in psutil.disk_partitions():
+        """Stop problem detection; returns once any in-flight check has finished"""
+        self._stop_event.set()
+        with self._lock:                    # waits out a running _tick
+            if self._scheduled is not None:
+                _SCHEDULER.cancel(self._scheduled)
+                self._scheduled = None
+            if self._udev_observer:
+                self._udev_observer.stop()
+                self._udev_observer = None
+            self._stats.close()
+            if self._disk_pool:
+                self._disk_pool.shutdown(wait=False)
+                self._disk_pool = None
+    
+    def _tick(self):
+        """One monitor cycle, run on the shared scheduler thread"""
+        with self._lock:
+            if self._stop_event.is_set():
+                return
+            fired = self._scheduled
             try:
-                usage = psutil.disk_usage(part.mountpoint)
-                if usage.percent > self.thresholds[ProblemType.STORAGE]:
-                    self.callback(f"Low disk space on {part.mountpoint}: {usage.percent}%", 105)
-            except:
-                continue
+                sample = self._snapshot()
+                self._evaluate(sample)
+                self._interval = self._next_interval(sample, self._interval)
+            except Exception:               # keep the thread alive for other detectors
+                traceback.print_exc()
+            # the callback may have stopped us, or stopped and restarted us (which
+            # already scheduled a fresh tick): only continue our own chain
+            if not self._stop_event.is_set() and self._scheduled is fired:
+                self._scheduled = _SCHEDULER.enter(self._interval, self._tick)
+    
+    def _next_interval(self, sample: Sample, interval: float) -> float:
+        """Back off while every reading is well clear of its threshold; snap back
+        to check_interval as soon as one gets near or a problem is open"""
+        lim = self._plan[0]
+        if sample.disk_pct is not None:         # slow tier; remembered between reads
+            self._disks_near = bool((sample.disk_pct > NEAR * lim.disk).any())
+        battery = sample.battery
+        if battery is not None:                 # read on the slow tier or on uevents
+            # lower is worse here, so "near" is within 1/NEAR of the floor
+            self._battery_near = (not battery.power_plugged
+                                  and battery.percent * NEAR < lim.battery)
+        near = (sample.cpu > NEAR * lim.cpu or sample.mem_pct > NEAR * lim.mem
+                or self._disks_near or self._battery_near
+                # an idle link reads as "stalled", so NETWORK doesn't count here
+                or not self._active <= {ProblemType.NETWORK})
+        if near:
+            return self.check_interval
+        return min(interval * 2, self.check_interval * MAX_BACKOFF)
+    
+    def _snapshot(self) -> Sample:
+        """Read every sensor back to back; the checks below only compare numbers"""
+        stats = self._stats
+        net_sent, net_recv = stats.net_bytes()
+        sample = Sample(
+            cpu=stats.cpu_percent(),
+            mem_pct=stats.mem_percent(),
+            net_sent=net_sent,
+            net_recv=net_recv,
+            net_ts=time.monotonic(),
+        )
+        slow = next(self._ticks) % SLOW_EVERY == 0
+        if slow:
+            sample.disk_pct, sample.disk_mounts = self._read_disks()
+        if self._battery_dirty if self._udev_observer else slow:
+            self._battery_dirty = False
+            sample.battery = _sensors_battery() if _sensors_battery else None
+        return sample
+    
+    def _read_disks(self) -> Tuple[np.ndarray, Tuple[str, ...]]:
+        now = time.monotonic()
+        if now - self._partitions_ts > PARTITIONS_TTL:
+            if now - self._skip_ts > SKIP_RETRY:    # hot-plugged or remounted since
+                self._skip_mounts.clear()
+                self._skip_ts = now
+            self._set_mounts(tuple(p.mountpoint for p in psutil.disk_partitions(all=False)
+                                   if p.fstype not in _SKIP_FSTYPES
+                                   and p.mountpoint not in self._skip_mounts))
+            self._partitions_ts = now
+        pct, mounts = self._disk_pct, self._mounts
+        if len(mounts) > 1:
+            # independent mounts are stat'ed concurrently: the sweep takes as
+            # long as the slowest mount rather than the sum of all of them
+            if self._disk_pool is None:
+                self._disk_pool = ThreadPoolExecutor(max_workers=DISK_WORKERS,
+                                                     thread_name_prefix="statvfs")
+            pct[:] = list(self._disk_pool.map(_disk_percent_or_nan, mounts))
+        elif mounts:
+            pct[0] = _disk_percent_or_nan(mounts[0])
+        failed = np.isnan(pct)
+        if failed.any():
+            # stop raising (and catching) OSError for them every sweep
+            self._skip_mounts.update(m for m, bad in zip(mounts, failed) if bad)
+            self._set_mounts(tuple(m for m, bad in zip(mounts, failed) if not bad))
+        return pct, mounts
+    
+    def _set_mounts(self, mounts: Tuple[str, ...]):
+        self._mounts = mounts
+        self._disk_pct = np.empty(len(mounts), dtype=np.float32)
+    
+    def _evaluate(self, sample: Sample):
+        lim, fast_check = self._plan
+        fast_check(sample)
+        self._check_storage(sample, lim)
+        self._check_network(sample, lim)
+        self._check_power(sample, lim)
+    
+    def _edge(self, problem: ProblemType, tripped: bool, cleared: bool) -> bool:
+        """True only on entering a problem; it then stays latched until cleared,
+        so a sustained condition is reported once rather than every tick"""
+        if problem in self._active:
+            if cleared:
+                self._active.discard(problem)
+            return False
+        if tripped:
+            self._active.add(problem)
+            return True
+        return False
+    
+    def _report(self, code: int, **payload):
+        # Only reached on a state change; legacy consumers get the formatted text
+        if self.structured:
+            self.callback(code, payload)
+        else:
+            self.callback(_MESSAGES[code].format(**payload), code)
+    
+    def _make_fast_check(self, lim: _Limits) -> Callable[[Sample], None]:
+        """Build the every-tick CPU/memory check for one set of limits, with the
+        thresholds, clear levels and helpers baked in as closure constants"""
+        edge, report = self._edge, self._report
+        CPU, MEMORY = ProblemType.CPU, ProblemType.MEMORY
+        cpu_thr, cpu_clear = lim.cpu, lim.cpu - HYSTERESIS
+        mem_thr, mem_clear = lim.mem, lim.mem - HYSTERESIS
+        
+        def check(sample: Sample):
+            cpu = sample.cpu
+            if edge(CPU, cpu > cpu_thr, cpu < cpu_clear):
+                report(103, percent=cpu)        # High CPU usage
+            mem = sample.mem_pct
+            if edge(MEMORY, mem > mem_thr, mem < mem_clear):
+                report(104, percent=mem)        # High memory usage
+        return check
+    
+    def _check_storage(self, sample: Sample, lim: _Limits):
+        """Check for low disk space"""
+        pct, mounts = sample.disk_pct, sample.disk_mounts
+        if pct is None:
+            return
+        # one vectorised compare; strings are only built for mounts that newly trip
+        for i in np.flatnonzero(pct > lim.disk):
+            if mounts[i] not in self._low_disks:
+                self._low_disks.add(mounts[i])
+                self._report(105, mountpoint=mounts[i], percent=round(float(pct[i]), 1))
+        for mountpoint in tuple(self._low_disks):
+            if mountpoint not in mounts:        # unmounted
+                self._low_disks.discard(mountpoint)
+            elif pct[mounts.index(mountpoint)] < lim.disk - HYSTERESIS:
+                self._low_disks.discard(mountpoint)
     
-    def _check_network(self):
+    def _check_network(self, sample: Sample, lim: _Limits):
         """Check for network connectivity issues"""
-        net1 = psutil.net_io_counters()
-        time.sleep(1)
-        net2 = psutil.net_io_counters()
+        (sent1, recv1), t1 = self._last_net, self._last_net_ts
+        t2 = sample.net_ts
+        self._last_net, self._last_net_ts = (sample.net_sent, sample.net_recv), t2
+        elapsed = max(t2 - t1, 1e-3)
         
-        upload = (net2.bytes_sent - net1.bytes_sent) / 1024
-        download = (net2.bytes_recv - net1.bytes_recv) / 1024
+        kb_per_s = 1.0 / (1024.0 * elapsed)
+        upload = (sample.net_sent - sent1) * kb_per_s
+        download = (sample.net_recv - recv1) * kb_per_s
         
-        if upload < self.thresholds[ProblemType.NETWORK]['min_upload'] and \
-           download < self.thresholds[ProblemType.NETWORK]['min_download']:
-            self.callback("Network connection unstable", 101)
+        stalled = upload < lim.up and download < lim.down
+        if self._edge(ProblemType.NETWORK, stalled, not stalled):
+            self._report(101, upload_kbps=round(upload, 1), download_kbps=round(download, 1))
     
-    def _check_power(self):
+    def _check_power(self, sample: Sample, lim: _Limits):
         """Check for power-related issues"""
-        if hasattr(psutil, "sensors_battery"):
-            battery = psutil.sensors_battery()
-            if battery and battery.percent < 20 and not battery.power_plugged:
-                self.callback(f"Low battery: {battery.percent}% remaining", 102)
\ No newline at end of file
+        battery = sample.battery
+        if battery is None:                 # not read this tick
+            return
+        low = battery.percent < lim.battery and not battery.power_plugged
+        recovered = battery.power_plugged or battery.percent >= lim.battery + HYSTERESIS
+        if self._edge(ProblemType.POWER, low, recovered):
+            self._report(102, percent=battery.percent)
@@ -2,20 +2,24 @@ import os
 import sys
 import json
 import time
+import hashlib
 import queue
+import socket
 import threading
 import platform
 import subprocess
 import webbrowser
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from functools import lru_cache
 from typing import Dict, List, Callable, Optional, Tuple
+import numpy as np
 import psutil
 import pyttsx3
 import requests
 import sv_ttk
-import ping3
-from fuzzywuzzy import fuzz
+from rapidfuzz import fuzz, process, utils
 from PIL import Image, ImageTk
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
@@ -32,6 +36,12 @@ try:
 except ImportError:
     _GTTS_OK = False
 
+try:
+    import orjson
+    _ORJSON_OK = True
+except ImportError:
+    _ORJSON_OK = False
+
 # ====================== CONSTANTS & PATHS ======================
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, "problems.json")
@@ -45,8 +55,23 @@ APP_NAME = "Techsewa Ultimate Pro"
 APP_VER = "5.0"
 ORG_INFO = "Learning Mission & Training Center"
 CONTACT = f"\n📍 {ORG_INFO}\n📞 9867315931  📧 learnermission@gmail.com"
+SAMPLE_TTL = 1.0  # seconds a CPU/RAM/disk sample is reused across widgets
+CHART_POINTS = 60  # samples of CPU history on the System tab chart
 
 # ====================== HELPER CLASSES ========================
+@lru_cache(maxsize=256)
+def _nepali_mp3(text: str) -> str:
+    """Cached gTTS mp3 for text; repeats skip the hash and the exists() check.
+    Keyed on a stable digest -- hash() is salted per process, which made
+    every launch miss the disk cache."""
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+    cache_file = os.path.join(CACHE_DIR, f"{digest}.mp3")
+    if not os.path.exists(cache_file):
+        tmp = cache_file + ".part"      # never leave a half-written mp3 behind
+        gTTS(text=text, lang="ne").save(tmp)
+        os.replace(tmp, cache_file)
+    return cache_file
+
 class DualTTS:
     """Enhanced TTS with caching and language support"""
     def __init__(self, rate=160, volume=0.95):
@@ -73,59 +98,103 @@ class DualTTS:
             self.queue.task_done()
 
     def _speak_nepali(self, text):
-        cache_file = os.path.join(CACHE_DIR, f"{hash(text)}.mp3")
-        if not os.path.exists(cache_file):
-            gTTS(text=text, lang="ne").save(cache_file)
-        playsound(cache_file, block=True)
+        playsound(_nepali_mp3(text), block=True)
 
     def _speak_english(self, text):
         self.eng_engine.say(text)
         self.eng_engine.runAndWait()
 
+@lru_cache(maxsize=1)
+def _hardware_names() -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """(GPU names, printer names), fetched once per session -- they hardly ever
+    change. One PowerShell CIM query replaces two (deprecated) wmic spawns;
+    "Refresh Hardware" clears the cache."""
+    if platform.system() != "Windows":
+        return (), ()
+    try:
+        output = subprocess.check_output(
+            ["powershell", "-NoProfile", "-Command",
+             "(Get-CimInstance Win32_VideoController).Name; '--'; "
+             "(Get-CimInstance Win32_Printer).Name"],
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+            timeout=15
+        ).decode(errors="replace")
+    except (OSError, subprocess.SubprocessError):
+        return (), ()
+    gpus, _, printers = output.partition("--")
+    return (tuple(l.strip() for l in gpus.splitlines() if l.strip()),
+            tuple(l.strip() for l in printers.splitlines() if l.strip()))
+
 class SystemScanner:
     """Comprehensive system diagnostics with monitoring"""
     def __init__(self):
-        self.xs = []
-        self.ys = []
+        # fixed-size CPU history, newest at the right; NaN = not sampled yet
+        self._ring = np.full(CHART_POINTS, np.nan, dtype=np.float32)
+        self._head = 0
         self.figure = Figure(figsize=(5, 2), dpi=100)
         self.ax = self.figure.add_subplot(111)
-        self.line, = self.ax.plot([], [])
+        self.line, = self.ax.plot(np.arange(CHART_POINTS), self._ring)
         self.ax.set_ylim(0, 100)
         self.ax.set_ylabel("%")
-        self.ax.set_xlim(0, 60)
+        self.ax.set_xlim(0, CHART_POINTS - 1)
+        # psutil keeps the non-blocking baseline per thread: prime it here and
+        # only ever call sample() from this (Tk) thread, or it reads 0.0
+        psutil.cpu_percent(interval=None)
+        self._sample = {}
+        self._sample_ts = float("-inf")
+
+    def sample(self) -> Dict:
+        """Latest CPU/RAM/disk percentages, refreshed at most every SAMPLE_TTL seconds"""
+        now = time.monotonic()
+        if now - self._sample_ts >= SAMPLE_TTL:
+            self._sample = {
+                "cpu": psutil.cpu_percent(interval=None),
+                "mem": psutil.virtual_memory().percent,
+                "disk": psutil.disk_usage('/').percent
+            }
+            self._sample_ts = now
+        return self._sample
         
     def full_scan(self) -> Dict:
+        # the probes mostly wait (sensors, the hardware-name subprocess), so run
+        # them side by side: the scan takes as long as the slowest one, not the sum.
+        # CPU usage is read here first: a pool thread has no cpu_percent baseline
+        usage = self.sample()["cpu"]
+        probes = {
+            "cpu": lambda: self._get_cpu_info(usage),
+            "memory": self._get_memory_info,
+            "storage": self._get_storage_info,
+            "network": self._get_network_info,
+            "gpu": self._get_gpu_info,
+            "printers": self._get_printers,
+            "sensors": self._get_sensor_data
+        }
+        with ThreadPoolExecutor(max_workers=len(probes)) as ex:
+            futures = {name: ex.submit(probe) for name, probe in probes.items()}
+            results = {name: fut.result() for name, fut in futures.items()}
         return {
             "system": {
                 "os": platform.platform(),
                 "hostname": platform.node(),
                 "architecture": platform.architecture()[0]
             },
-            "cpu": self._get_cpu_info(),
-            "memory": self._get_memory_info(),
-            "storage": self._get_storage_info(),
-            "network": self._get_network_info(),
-            "gpu": self._get_gpu_info(),
-            "printers": self._get_printers(),
-            "sensors": self._get_sensor_data()
+            **results
         }
 
     def update_chart(self):
         """Update CPU usage chart"""
-        self.xs.append(len(self.xs))
-        self.ys.append(psutil.cpu_percent())
-        self.xs = self.xs[-60:]
-        self.ys = self.ys[-60:]
-        self.line.set_data(self.xs, self.ys)
-        self.ax.set_xlim(max(0, len(self.xs)-60), len(self.xs))
+        self._ring[self._head] = self.sample()["cpu"]
+        self._head = (self._head + 1) % CHART_POINTS
+        # x stays fixed; only the y data is swapped, oldest sample first
+        self.line.set_ydata(np.roll(self._ring, -self._head))
         return self.figure
 
-    def _get_cpu_info(self):
+    def _get_cpu_info(self, usage: float):
         return {
             "model": platform.processor(),
             "physical_cores": psutil.cpu_count(logical=False),
             "total_cores": psutil.cpu_count(logical=True),
-            "usage": psutil.cpu_percent(interval=1)
+            "usage": usage  # from sample(): non-blocking, unlike interval=1
         }
 
     def _get_memory_info(self):
@@ -139,7 +208,12 @@ class SystemScanner:
     def _get_storage_info(self):
         partitions = []
         for part in psutil.disk_partitions():
-            usage = psutil.disk_usage(part.mountpoint)
+            if 'cdrom' in part.opts:    # empty optical drives block, then raise
+                continue
+            try:
+                usage = psutil.disk_usage(part.mountpoint)
+            except OSError:
+                continue
             partitions.append({
                 "device": part.device,
                 "mountpoint": part.mountpoint,
@@ -160,26 +234,11 @@ class SystemScanner:
         }
 
     def _get_gpu_info(self):
-        try:
-            if platform.system() == "Windows":
-                output = subprocess.check_output(
-                    ["wmic", "path", "win32_VideoController", "get", "name"]
-                ).decode().splitlines()
-                return output[1].strip() if len(output) > 1 else "Unknown"
-        except:
-            pass
-        return "Unknown"
+        gpus = _hardware_names()[0]
+        return gpus[0] if gpus else "Unknown"
 
     def _get_printers(self):
-        try:
-            if platform.system() == "Windows":
-                output = subprocess.check_output(
-                    ["wmic", "printer", "get", "name"]
-                ).decode().splitlines()
-                return [line.strip() for line in output[1:] if line.strip()]
-        except:
-            pass
-        return []
+        return list(_hardware_names()[1])
 
     def _get_sensor_data(self):
         try:
@@ -193,50 +252,88 @@ class SystemScanner:
 
 class ProblemDetector(threading.Thread):
     """Background system monitoring with alerts"""
+    CPU_INTERVAL = 5        # seconds between CPU/RAM reads (cheap, local)
+    NET_INTERVAL = 30       # seconds between connectivity probes (a network round trip)
+
     def __init__(self, alert_callback):
         super().__init__(daemon=True)
         self.alert_callback = alert_callback
-        
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        """Wake and end the monitor loop (e.g. on window close)"""
+        self._stop_event.set()
+
     def run(self):
-        while True:
-            # CPU monitoring
-            cpu = psutil.cpu_percent()
-            if cpu > 90: 
-                self.alert_callback("CPU over 90%", 101)
-                
-            # Memory monitoring
-            mem = psutil.virtual_memory().percent
-            if mem > 90:
-                self.alert_callback("RAM over 90%", 102)
-                
-            # Network monitoring
-            try:
-                dl = ping3.ping("8.8.8.8", unit="ms", timeout=1)
-                if dl is None:
-                    self.alert_callback("Internet unreachable", 103)
-            except:
-                self.alert_callback("Network error", 104)
-                
-            time.sleep(5)
+        next_res = next_net = time.monotonic()
+        while not self._stop_event.is_set():
+            now = time.monotonic()
+            if now >= next_res:
+                self._check_resources()
+                next_res = now + self.CPU_INTERVAL
+            if now >= next_net:
+                self._check_network()
+                next_net = now + self.NET_INTERVAL
+            # sleep until whichever check is due next; stop() cuts it short
+            self._stop_event.wait(max(0.0, min(next_res, next_net) - time.monotonic()))
+
+    def _check_resources(self):
+        # CPU monitoring
+        cpu = psutil.cpu_percent()
+        if cpu > 90: 
+            self.alert_callback("CPU over 90%", 101)
+            
+        # Memory monitoring
+        mem = psutil.virtual_memory().percent
+        if mem > 90:
+            self.alert_callback("RAM over 90%", 102)
+
+    def _check_network(self):
+        # Network monitoring: a TCP connect to public DNS needs no raw-socket
+        # privileges (ICMP ping does on Linux) and no subprocess
+        try:
+            socket.create_connection(("8.8.8.8", 53), timeout=1).close()
+        except OSError:
+            # covers timeouts and resolver errors; anything else is a bug, not an outage
+            self.alert_callback("Internet unreachable", 103)
 
 class AutoHealer:
     """Automated system issue resolution"""
+    def __init__(self):
+        # process_iter() hands back the same Process objects on later calls, so
+        # this primes their cpu_percent: heal() then sees real usage, not 0.0
+        for _ in psutil.process_iter(['cpu_percent']):
+            pass
+
+    @staticmethod
+    def _top_process(attr: str) -> Optional[psutil.Process]:
+        # process_iter(attrs) reads each process inside oneshot(); AccessDenied
+        # leaves the value None. Never pick init/idle or ourselves.
+        skip = (0, 1, os.getpid())
+        top = max((p for p in psutil.process_iter(['name', attr])
+                   if p.info[attr] is not None and p.pid not in skip),
+                  key=lambda p: p.info[attr], default=None)
+        # all zeros (nothing measured yet): max() would just return the first pid
+        return top if top is not None and top.info[attr] > 0 else None
+
     def heal(self, code: int) -> str:
         try:
             if code == 101:  # High CPU
-                top = [p for p in psutil.process_iter(['pid', 'name', 'cpu_percent'])]
-                top.sort(key=lambda p: p.info['cpu_percent'], reverse=True)
-                top[0].kill()
-                return f"Killed {top[0].info['name']} (high CPU)"
+                top = self._top_process('cpu_percent')
+                if top is None:
+                    return "No process is using noticeable CPU"
+                top.kill()
+                return f"Killed {top.info['name']} (high CPU)"
                 
             elif code == 102:  # High memory
-                top = [p for p in psutil.process_iter(['pid', 'name', 'memory_percent'])]
-                top.sort(key=lambda p: p.info['memory_percent'], reverse=True)
-                top[0].kill()
-                return f"Killed {top[0].info['name']} (high memory)"
+                top = self._top_process('memory_percent')
+                if top is None:
+                    return "No process is using noticeable memory"
+                top.kill()
+                return f"Killed {top.info['name']} (high memory)"
                 
             elif code == 103:  # Network issue
-                subprocess.call("ipconfig /flushdns", shell=True)
+                subprocess.call(["ipconfig", "/flushdns"])
                 return "DNS cache flushed"
                 
             elif code == 104:  # Network error
@@ -246,11 +343,39 @@ class AutoHealer:
             return f"Healing failed: {str(e)}"
         return "No solution available"
 
+def _normalize(text: str) -> str:
+    """rapidfuzz's default_process (lowercase, punctuation to spaces) with runs
+    of whitespace collapsed, so "WiFi  slow" and "wifi slow!" are one key"""
+    return " ".join(utils.default_process(text).split())
+
+class _AliasIndex:
+    """Alias lookup tables for one version of the knowledge base. Never mutated
+    once built; hashes by identity, so it can be part of the match-cache key."""
+    __slots__ = ("choices", "owners", "exact", "token_index")
+
+    def __init__(self, problems: List[Dict]):
+        pairs = [(_normalize(alias), problem)
+                 for problem in problems
+                 for alias in problem.get("aliases", [])]
+        self.choices = [alias for alias, _ in pairs]
+        self.owners = [problem for _, problem in pairs]
+        # whole-query hits are a dict probe; the token index narrows the fuzzy pass
+        self.exact: Dict[str, int] = {}
+        self.token_index: Dict[str, List[int]] = defaultdict(list)
+        for pos, alias in enumerate(self.choices):
+            self.exact.setdefault(alias, pos)
+            for tok in set(alias.split()):
+                self.token_index[tok].append(pos)
+
 class SmartBrainPro:
     """Enhanced problem-solving engine with semantic capabilities"""
     def __init__(self, db_path: str, min_confidence: int = 80, internet: bool = True):
-        with open(db_path, "r", encoding="utf-8") as f:
-            self.problems = json.load(f)
+        if _ORJSON_OK:
+            with open(db_path, "rb") as f:
+                self.problems = orjson.loads(f.read())
+        else:
+            with open(db_path, "r", encoding="utf-8") as f:
+                self.problems = json.load(f)
         self.min_confidence = min_confidence
         self.internet = internet
         self.query_history = []
@@ -260,21 +385,52 @@ class SmartBrainPro:
             "cached_matches": 0,
             "internet_lookups": 0
         }
+        # per-instance so the cache neither keys on nor keeps alive `self`
+        self._match_cached = lru_cache(maxsize=2048)(self._match_norm)
+        self._build_alias_index()
+
+    def _build_alias_index(self):
+        """Pre-process every alias once; rebuilt whenever the knowledge base changes.
+        Teach/edit/delete run this on the Tk thread while the solver thread matches,
+        so the new index is built aside and published with one assignment."""
+        self._index = _AliasIndex(self.problems)
+        self._match_cached.cache_clear()
 
-    @lru_cache(maxsize=1000)
     def _match(self, query: str, lang: str = "en") -> Optional[Dict]:
-        query = query.lower()
-        best_match = None
-        best_score = 0
-        
-        for problem in self.problems:
-            for alias in problem.get("aliases", []):
-                score = fuzz.token_set_ratio(query, alias.lower())
-                if score > best_score and score >= self.min_confidence:
-                    best_match = problem
-                    best_score = score
-                    self.stats["cached_matches"] += 1
-        return best_match
+        # cache on the normalised text so case/punctuation/spacing variants share an entry;
+        # the cutoff is part of the key since settings can change it at runtime, and so
+        # is the index, so a match still running against the old one can't be served later
+        return self._match_cached(_normalize(query), self.min_confidence, self._index)
+
+    def match_cache_info(self):
+        return self._match_cached.cache_info()
+
+    def _match_norm(self, query: str, min_confidence: int, index: "_AliasIndex") -> Optional[Dict]:
+        pos = index.exact.get(query)
+        if pos is None:
+            # score aliases sharing a token with the query first; the full scan
+            # only runs when none of them pass (typos share no token)
+            candidates = {p: index.choices[p]
+                          for tok in set(query.split())
+                          for p in index.token_index.get(tok, ())}
+            hit = None
+            if candidates:
+                hit = process.extractOne(query, candidates, scorer=fuzz.token_set_ratio,
+                                         processor=None, score_cutoff=min_confidence)
+            if hit is not None:
+                pos = hit[2]
+            elif len(candidates) < len(index.choices):
+                # full pass: the whole score row in one multi-threaded C call
+                scores = process.cdist([query], index.choices, scorer=fuzz.token_set_ratio,
+                                       processor=None, score_cutoff=min_confidence,
+                                       dtype=np.uint8, workers=-1)[0]
+                pos = int(scores.argmax())
+                if scores[pos] < min_confidence:
+                    return None
+            else:
+                return None
+        self.stats["cached_matches"] += 1
+        return index.owners[pos]
 
     def solve(self, query: str, lang: str = "en") -> Dict:
         self.query_history.append((datetime.now().isoformat(), query, lang))
@@ -344,10 +500,16 @@ class SmartBrainPro:
 
     def _save_knowledge(self):
         try:
-            with open(DB_PATH, "w", encoding="utf-8") as f:
-                json.dump(self.problems, f, indent=2, ensure_ascii=False)
+            if _ORJSON_OK:
+                # serialised in C straight to bytes; rewritten on every teach/edit/delete
+                with open(DB_PATH, "wb") as f:
+                    f.write(orjson.dumps(self.problems, option=orjson.OPT_INDENT_2))
+            else:
+                with open(DB_PATH, "w", encoding="utf-8") as f:
+                    json.dump(self.problems, f, indent=2, ensure_ascii=False)
         except Exception as e:
             print(f"Failed to save knowledge base: {e}")
+        self._build_alias_index()
 
 # ====================== MAIN APPLICATION =======================
 class TechsewaProApp(tk.Tk):
@@ -377,6 +539,12 @@ class TechsewaProApp(tk.Tk):
         self.scanner = SystemScanner()
         self.healer = AutoHealer()
         
+        # One long-lived solver thread fed by a queue (instead of a thread per
+        # query), so queries are answered in order. Knowledge-base edits still run
+        # on the Tk thread; SmartBrainPro swaps its alias index in atomically
+        self._solve_q = queue.Queue()
+        threading.Thread(target=self._solve_worker, daemon=True).start()
+        
         # Setup UI
         self._setup_styles()
         self._build_ui()
@@ -386,6 +554,14 @@ class TechsewaProApp(tk.Tk):
         
         # Initial system scan
         self.after(1000, self._run_system_scan)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    def _on_close(self):
+        """Stop background monitoring before the window goes away"""
+        detector = getattr(self, "detector", None)
+        if detector:
+            detector.stop()
+        self.destroy()
 
     def _setup_styles(self):
         """Configure macOS-inspired styles with modern touches"""
@@ -533,6 +709,7 @@ class TechsewaProApp(tk.Tk):
         
         # Start with assistant tab visible
         self.notebook.select(0)
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
 
     def _build_assistant_tab(self):
         """Build the assistant chat interface with enhanced features"""
@@ -595,6 +772,8 @@ class TechsewaProApp(tk.Tk):
         """Build the system info tab with live monitoring"""
         tab = ttk.Frame(self.notebook)
         self.notebook.add(tab, text="System")
+        self._system_tab = tab
+        self._scan_stale = False      # a scan was skipped while the tab was hidden
         
         # System info display
         sys_frame = ttk.LabelFrame(tab, text="System Information", padding=15)
@@ -641,6 +820,12 @@ class TechsewaProApp(tk.Tk):
             command=self._run_system_scan
         ).pack(side=tk.LEFT)
         
+        ttk.Button(
+            btn_frame,
+            text="Refresh Hardware",
+            command=self._refresh_hardware
+        ).pack(side=tk.LEFT, padx=5)
+        
         ttk.Button(
             btn_frame,
             text="Export Report",
@@ -917,11 +1102,12 @@ class TechsewaProApp(tk.Tk):
         self.status_var.set("Processing...")
         
         # Process in background thread
-        threading.Thread(
-            target=self._solve_query,
-            args=(query,),
-            daemon=True
-        ).start()
+        self._solve_q.put(query)
+
+    def _solve_worker(self):
+        """Answer queued queries one at a time, in order"""
+        while True:
+            self._solve_query(self._solve_q.get())
 
     def _solve_query(self, query: str):
         """Get solution from brain and display it"""
@@ -964,8 +1150,24 @@ class TechsewaProApp(tk.Tk):
         self.chat_display.config(state="disabled")
         self.chat_display.see(tk.END)
 
+    def _system_tab_visible(self) -> bool:
+        return self.notebook.select() == str(self._system_tab)
+
+    def _on_tab_changed(self, event=None):
+        """Catch up on System-tab work that was skipped while it was hidden"""
+        if self._system_tab_visible():
+            self.canvas.draw_idle()
+            if self._scan_stale:
+                self._run_system_scan()
+
     def _run_system_scan(self):
         """Perform comprehensive system scan"""
+        if not self._system_tab_visible():
+            # the report is only shown on the System tab: defer the sensor,
+            # per-partition and hardware-name probes until it is opened
+            self._scan_stale = True
+            return
+        self._scan_stale = False
         self.status_var.set("Scanning system...")
         
         try:
@@ -980,7 +1182,7 @@ class TechsewaProApp(tk.Tk):
             # Update sidebar indicators
             cpu_usage = scan_results["cpu"]["usage"]
             mem_usage = scan_results["memory"]["percent_used"]
-            disk_usage = psutil.disk_usage('/').percent
+            disk_usage = self.scanner.sample()["disk"]
             
             self.cpu_label.config(text=f"CPU: {cpu_usage}%")
             self.mem_label.config(text=f"RAM: {mem_usage}%")
@@ -990,6 +1192,11 @@ class TechsewaProApp(tk.Tk):
         except Exception as e:
             self.status_var.set(f"Scan failed: {str(e)}")
 
+    def _refresh_hardware(self):
+        """Re-query GPU and printers (e.g. after adding a printer), then rescan"""
+        _hardware_names.cache_clear()
+        self._run_system_scan()
+
     def _export_system_report(self):
         """Export system report to file"""
         file_path = filedialog.asksaveasfilename(
@@ -1053,23 +1260,25 @@ class TechsewaProApp(tk.Tk):
     def _start_background_tasks(self):
         """Start background monitoring tasks"""
         def update_system_stats():
-            # Update CPU chart
+            # Update CPU chart (history keeps filling; only render it when seen)
             self.scanner.update_chart()
-            self.canvas.draw()
-            
-            # Update metrics
-            cpu = psutil.cpu_percent()
-            mem = psutil.virtual_memory().percent
-            disk = psutil.disk_usage('/').percent
-            
-            self.diag_vars["cpu_percent"].set(f"{cpu}%")
-            self.diag_progress["cpu_percent"]["value"] = cpu
             
-            self.diag_vars["virtual_memory"].set(f"{mem}%")
-            self.diag_progress["virtual_memory"]["value"] = mem
+            # Update metrics (same sample the chart just took; a second
+            # cpu_percent() call here would measure a ~0 ms window)
+            stats = self.scanner.sample()
+            cpu, mem, disk = stats["cpu"], stats["mem"], stats["disk"]
             
-            self.diag_vars["disk_usage"].set(f"{disk}%")
-            self.diag_progress["disk_usage"]["value"] = disk
+            if self._system_tab_visible():
+                self.canvas.draw_idle()
+                
+                self.diag_vars["cpu_percent"].set(f"{cpu}%")
+                self.diag_progress["cpu_percent"]["value"] = cpu
+                
+                self.diag_vars["virtual_memory"].set(f"{mem}%")
+                self.diag_progress["virtual_memory"]["value"] = mem
+                
+                self.diag_vars["disk_usage"].set(f"{disk}%")
+                self.diag_progress["disk_usage"]["value"] = disk
             
             # Update network stats
             net1 = psutil.net_io_counters()